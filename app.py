@@ -1,15 +1,25 @@
 #app.py 
+import time
 import streamlit as st
-import pandas as pd
-from fpdf import FPDF
+from utils import profiler
+from utils.data_loader import catalog_version, tenant, use_tenant
+from utils.metrics import incr, observe_since, timed
+from utils.view_cache import cached_view
+from engine.report_renderer import REPORT_TOP_K, render_report_pdf, student_profile
 from engine.recommendation_engine import (
+    get_boards,
     get_streams_by_board,
     get_subject_combinations,
     get_course_categories,
-    recommend_courses,
-    courses as COURSE_DATA
+    get_courses,
+    rank_courses,
+    search_catalog
 )
 
+rerun_started = time.perf_counter()
+# Profiled when armed from the admin Dashboard
+profile_run = profiler.begin("app")
+
 # ======================================================
 # PAGE CONFIG
 # ======================================================
@@ -19,6 +29,21 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ======================================================
+# TENANT
+# ======================================================
+# A school's link names its catalog, ?tenant=<name>, and the session keeps
+# it for the other pages; without one the default catalog is served
+tenant_name = st.query_params.get("tenant") or st.session_state.get("tenant")
+try:
+    use_tenant(tenant_name)
+except ValueError as e:
+    st.error(str(e))
+    observe_since("student.rerun", rerun_started)
+    profiler.end(profile_run)
+    st.stop()
+st.session_state.tenant = tenant_name
+
 # ======================================================
 # STYLES (TECH + PROFESSIONAL)
 # ======================================================
@@ -93,6 +118,38 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# ======================================================
+# COURSE SEARCH
+# ======================================================
+st.markdown("<div class='card'>", unsafe_allow_html=True)
+st.markdown("<div class='section-title'>🔎 Find a Course</div>", unsafe_allow_html=True)
+
+query = st.text_input("Search courses and categories", placeholder="Try \"cyber\" or \"biotech\"")
+if query:
+    with timed("student.search"):
+        hits = search_catalog(query)
+
+    if hits:
+        st.dataframe(
+            [
+                {
+                    "Name": hit["name"],
+                    "Type": hit["kind"].title(),
+                    "Category": ", ".join(hit["categories"]),
+                    "Subject Combinations": ", ".join(hit["subject_combos"]),
+                    "Minimum %": hit["min_marks"]
+                }
+                for hit in hits
+            ],
+            hide_index=True,
+            width="stretch",
+            column_config={"Minimum %": st.column_config.NumberColumn("Minimum %", format="%g")}
+        )
+    else:
+        st.caption("No matching courses or categories")
+
+st.markdown("</div>", unsafe_allow_html=True)
+
 # ======================================================
 # STUDENT PROFILE
 # ======================================================
@@ -103,12 +160,14 @@ c1, c2 = st.columns(2)
 with c1:
     name = st.text_input("Student Name", placeholder="Enter full name")
 with c2:
-    board = st.selectbox("Education Board", ["CBSE", "ICSE", "State Board"])
+    board = st.selectbox("Education Board", get_boards())
 
 st.markdown("</div>", unsafe_allow_html=True)
 
 if not name:
     st.info("Please enter student name to proceed.")
+    observe_since("student.rerun", rerun_started)
+    profiler.end(profile_run)
     st.stop()
 
 # ======================================================
@@ -131,18 +190,29 @@ st.markdown("</div>", unsafe_allow_html=True)
 st.markdown("<div class='card'>", unsafe_allow_html=True)
 st.markdown("<div class='section-title'>📚 Eligible Course Landscape</div>", unsafe_allow_html=True)
 
-categories = get_course_categories(subject_combo)
-available_rows = [
-    {"Category": cat, "Course Name": c}
-    for cat in categories
-    for c in COURSE_DATA.get(cat, [])
-]
-
-st.dataframe(
-    pd.DataFrame(available_rows),
-    hide_index=True,
-    width="stretch"
-)
+# Tables are built once per catalog version and shared by every session;
+# read the version before the catalog so a table is never older than it
+version = catalog_version()
+
+def landscape_table(categories):
+    import pyarrow as pa
+
+    pairs = [(cat, c) for cat in categories for c in get_courses(cat)]
+    return pa.table({
+        "Category": pa.array([cat for cat, _ in pairs], pa.string()),
+        "Course Name": pa.array([c for _, c in pairs], pa.string())
+    })
+
+with timed("student.landscape_build"):
+    categories = get_course_categories(subject_combo)
+    landscape = cached_view(version, ("landscape", subject_combo), lambda: landscape_table(categories), scope=tenant_name)
+
+with timed("student.landscape_render"):
+    st.dataframe(
+        landscape,
+        hide_index=True,
+        width="stretch"
+    )
 st.markdown("</div>", unsafe_allow_html=True)
 
 # ======================================================
@@ -154,13 +224,76 @@ st.markdown("<div class='section-title'>📊 Expected Performance</div>", unsafe
 marks = st.slider("Expected Percentage", 40, 100, step=5)
 st.markdown("</div>", unsafe_allow_html=True)
 
+# ======================================================
+# PDF REPORT
+# ======================================================
+# Cached across sessions on (profile, results, tenant, catalog version);
+# the least recently used reports are dropped past max_entries.
+@st.cache_data(max_entries=256, show_spinner=False)
+def build_report_pdf(profile, best_fit, alternate, best_fit_total, alternate_total, tenant_name, version):
+    incr("student.pdf_cache_miss")
+    with timed("student.pdf_render"):
+        return render_report_pdf(profile, best_fit, alternate, best_fit_total, alternate_total)
+
 # ======================================================
 # RESULTS
 # ======================================================
+# Courses per page in the result tables; only that page is ranked and rendered
+PAGE_SIZE = 20
+
+ALTERNATE_BUCKETS = ("safe_options", "backup_options")
+
+def page_selector(label, pages, key):
+    # Page number widget; clamped first, since a new result can have fewer pages
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    if pages == 1:
+        return 1
+    return st.number_input(f"{label} page (of {pages})", 1, pages, step=1, key=key)
+
+def results_view(subject_combo, marks, buckets, page, board):
+    # One page of ranked courses as a table, with the paging it came from
+    import pyarrow as pa
+
+    ranked = rank_courses(subject_combo, marks, buckets, k=PAGE_SIZE, page=page, board=board)
+    first = (ranked["page"] - 1) * PAGE_SIZE + 1
+    ranked["table"] = pa.table({
+        "S.No": pa.array(range(first, first + len(ranked["courses"])), pa.int64()),
+        "Course Name": pa.array(ranked["courses"], pa.string())
+    })
+    return ranked
+
+def cached_results(buckets, page):
+    return cached_view(
+        version,
+        ("results", subject_combo, marks, buckets, page, board),
+        lambda: results_view(subject_combo, marks, buckets, page, board),
+        size=lambda view: view["table"].nbytes + 64 * len(view["courses"]),
+        scope=tenant_name
+    )
+
+def result_table(table):
+    st.dataframe(
+        table,
+        hide_index=True,
+        width="stretch",
+        column_config={
+            "S.No": st.column_config.NumberColumn("S.No", width="small"),
+            "Course Name": st.column_config.TextColumn("Course Name", width="large")
+        }
+    )
+
+# Results stay up across reruns (e.g. paging) until the profile changes
 if st.button("🎯 Generate Career Insights", width="stretch"):
+    st.session_state.insights_for = (tenant_name, board, subject_combo, marks)
 
-    results = recommend_courses(subject_combo, marks)
-    alternate = list(set(results["safe_options"] + results["backup_options"]))
+if st.session_state.get("insights_for") == (tenant_name, board, subject_combo, marks):
+
+    best_page = st.session_state.get("best_fit_page", 1)
+    alternate_page = st.session_state.get("alternate_page", 1)
+    with timed("student.recommend"):
+        best_fit = cached_results(("best_fit",), best_page)
+        alternate = cached_results(ALTERNATE_BUCKETS, alternate_page)
 
     # ---------------- KPI CARDS ----------------
     st.markdown("<div class='card'>", unsafe_allow_html=True)
@@ -169,7 +302,7 @@ if st.button("🎯 Generate Career Insights", width="stretch"):
     k1.markdown(f"<div class='kpi-card'><div class='kpi-value'>{marks}%</div><div class='kpi-label'>EXPECTED SCORE</div></div>", unsafe_allow_html=True)
     k2.markdown(f"<div class='kpi-card'><div class='kpi-value'>{stream}</div><div class='kpi-label'>STREAM</div></div>", unsafe_allow_html=True)
     k3.markdown(f"<div class='kpi-card'><div class='kpi-value'>{len(categories)}</div><div class='kpi-label'>CAREER DOMAINS</div></div>", unsafe_allow_html=True)
-    k4.markdown(f"<div class='kpi-card'><div class='kpi-value'>{len(results['best_fit'])}</div><div class='kpi-label'>BEST FIT COURSES</div></div>", unsafe_allow_html=True)
+    k4.markdown(f"<div class='kpi-card'><div class='kpi-value'>{best_fit['total']}</div><div class='kpi-label'>BEST FIT COURSES</div></div>", unsafe_allow_html=True)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -186,108 +319,48 @@ if st.button("🎯 Generate Career Insights", width="stretch"):
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         st.markdown("<div class='section-title'>✅ Recommended Courses</div>", unsafe_allow_html=True)
 
-        rec_df = pd.DataFrame({
-            "S.No": range(1, len(results["best_fit"]) + 1),
-            "Course Name": results["best_fit"]
-        })
-
-        st.dataframe(
-            rec_df,
-            hide_index=True,
-            width="stretch",
-            column_config={
-                "S.No": st.column_config.NumberColumn("S.No", width="small"),
-                "Course Name": st.column_config.TextColumn("Course Name", width="large")
-            }
-        )
+        with timed("student.results_render"):
+            result_table(best_fit["table"])
+            page_selector("Recommended", best_fit["pages"], "best_fit_page")
         st.markdown("</div>", unsafe_allow_html=True)
 
     with col2:
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         st.markdown("<div class='section-title'>🔁 Alternate Career Options</div>", unsafe_allow_html=True)
 
-        alt_df = pd.DataFrame({
-            "S.No": range(1, len(alternate) + 1),
-            "Course Name": alternate
-        })
-
-        st.dataframe(
-            alt_df,
-            hide_index=True,
-            width="stretch",
-            column_config={
-                "S.No": st.column_config.NumberColumn("S.No", width="small"),
-                "Course Name": st.column_config.TextColumn("Course Name", width="large")
-            }
-        )
+        with timed("student.results_render"):
+            result_table(alternate["table"])
+            page_selector("Alternate", alternate["pages"], "alternate_page")
         st.markdown("</div>", unsafe_allow_html=True)
 
     # ======================================================
     # PROFESSIONAL PDF REPORT (TABLE-BASED)
     # ======================================================
-    def clean(txt):
-        return txt.encode("latin-1", "ignore").decode("latin-1")
-
-    pdf = FPDF()
-    pdf.add_page()
-
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 12, clean("Career Recommendation Report"), ln=True, align="C")
-    pdf.ln(6)
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, clean("Student Profile"), ln=True)
-
-    pdf.set_font("Arial", size=11)
-    profile = [
-        ("Student Name", name),
-        ("Board", board),
-        ("Stream", stream),
-        ("Subject Combination", subject_combo),
-        ("Expected Marks", f"{marks}%")
-    ]
-
-    for label, value in profile:
-        pdf.cell(60, 8, clean(label), border=1)
-        pdf.cell(120, 8, clean(value), border=1, ln=True)
-
-    pdf.ln(6)
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, clean("Recommended Courses"), ln=True)
-
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(20, 8, "S.No", border=1)
-    pdf.cell(160, 8, "Course Name", border=1, ln=True)
-
-    pdf.set_font("Arial", size=11)
-    for i, c in enumerate(results["best_fit"], start=1):
-        pdf.cell(20, 8, str(i), border=1)
-        pdf.cell(160, 8, clean(c), border=1, ln=True)
-
-    pdf.ln(6)
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, clean("Alternate Career Options"), ln=True)
-
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(20, 8, "S.No", border=1)
-    pdf.cell(160, 8, "Course Name", border=1, ln=True)
-
-    pdf.set_font("Arial", size=11)
-    if alternate:
-        for i, c in enumerate(alternate, start=1):
-            pdf.cell(20, 8, str(i), border=1)
-            pdf.cell(160, 8, clean(c), border=1, ln=True)
-    else:
-        pdf.cell(180, 8, clean("No alternate options available"), border=1, ln=True)
-
-    file_name = f"{name}_Career_Recommendation_Report.pdf"
-    pdf.output(file_name)
+    profile = student_profile(name, board, stream, subject_combo, marks)
+
+    # Rendered in memory only when the button is clicked, on another
+    # thread, so under the session's tenant again; the report lists the
+    # top REPORT_TOP_K courses of each table
+    def report_pdf():
+        with tenant(tenant_name):
+            report_best = rank_courses(subject_combo, marks, ("best_fit",), k=REPORT_TOP_K, board=board)
+            report_alternate = rank_courses(subject_combo, marks, ALTERNATE_BUCKETS, k=REPORT_TOP_K, board=board)
+            return build_report_pdf(
+                profile,
+                tuple(report_best["courses"]),
+                tuple(report_alternate["courses"]),
+                report_best["total"],
+                report_alternate["total"],
+                tenant_name,
+                catalog_version()
+            )
 
     st.download_button(
         "📄 Download Professional Career Report (PDF)",
-        data=open(file_name, "rb").read(),
-        file_name=file_name,
+        data=report_pdf,
+        file_name=f"{name}_Career_Recommendation_Report.pdf",
         mime="application/pdf"
     )
+
+observe_since("student.rerun", rerun_started)
+profiler.end(profile_run)
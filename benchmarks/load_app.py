@@ -0,0 +1,308 @@
+#benchmarks/load_app.py
+#
+# End-to-end load on the Streamlit pages, driven headlessly with
+# streamlit.testing: every simulated interaction re-runs the whole page
+# script, as it does for a browser session.
+#   python -m benchmarks.load_app --sessions 40 --workers 4
+#   python -m benchmarks.load_app --scale medium --save-baseline
+#   python -m benchmarks.load_app --scale medium   # compares to the baseline
+#
+# A student session fills the profile, moves the marks slider, generates
+# insights and renders the PDF report; an admin session logs in, searches
+# and opens each section. Nothing is written to the catalog.
+#
+# AppTest swaps process-wide runtime state on every run, so concurrent
+# sessions are spread over worker processes. Each worker interleaves its
+# sessions one step at a time, so they are all alive together, the way a
+# server holds its sessions.
+#
+# Reports rerun latency per step (p50/p95/p99), throughput across workers
+# and memory per session (a worker's RSS growth over its live sessions).
+# Exits non-zero when a p95 or the memory per session is worse than the
+# baseline by more than --tolerance, or throughput is lower by as much.
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_catalog import SCALES, generate, write_catalog
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "app.py")
+ADMIN = os.path.join(ROOT, "pages", "Master_Admin.py")
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "load_baseline.json")
+
+# Seconds a single rerun may take before the session counts as failed
+RERUN_TIMEOUT = 60
+
+# ======================================================
+# SESSIONS
+# ======================================================
+# Generators yielding (step, seconds, error) per interaction; error ends the session
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run(step, at, change=None):
+    started = time.perf_counter()
+    if change is not None:
+        change()
+    at.run()
+    seconds = time.perf_counter() - started
+    error = at.exception[0].message if at.exception else None
+    return step, seconds, error
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+def student_session(rng, marks_moves):
+    from streamlit.testing.v1 import AppTest
+    from engine.report_renderer import render_student_report
+
+    at = AppTest.from_file(APP, default_timeout=RERUN_TIMEOUT)
+    yield _run("student.open", at)
+
+    name = f"Student {rng.randrange(10_000)}"
+    yield _run("student.profile", at, lambda: _widget(at.text_input, "Student Name").set_value(name))
+
+    # Boards, streams and combinations are whatever the served catalog offers
+    picks = {}
+    for label in ("Education Board", "Stream", "Subject Combination"):
+        box = _widget(at.selectbox, label)
+        if not box.options:
+            yield "student.profile", 0.0, f"No {label} options to pick from"
+            return
+        picks[label] = rng.choice(box.options)
+        yield _run("student.profile", at, lambda: box.set_value(picks[label]))
+
+    slider = lambda: _widget(at.slider, "Expected Percentage")
+    for _ in range(marks_moves):
+        marks = rng.randrange(40, 101, 5)
+        yield _run("student.marks", at, lambda: slider().set_value(marks))
+
+    generate = lambda: next(b for b in at.button if "Generate Career Insights" in b.label).click()
+    yield _run("student.insights", at, generate)
+
+    # Download buttons run their callable outside a rerun, when clicked, so
+    # the harness renders the same report directly
+    started = time.perf_counter()
+    render_student_report(name, picks["Education Board"], picks["Stream"], picks["Subject Combination"], slider().value)
+    yield "student.report", time.perf_counter() - started, None
+
+def admin_session(rng, search_terms):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(ADMIN, default_timeout=RERUN_TIMEOUT)
+    yield _run("admin.open", at)
+
+    def login():
+        _widget(at.text_input, "Username").set_value("admin")
+        _widget(at.text_input, "Password").set_value("admin123")
+        _widget(at.button, "Login").click()
+    # Includes the st.rerun() into the Dashboard
+    yield _run("admin.login", at, login)
+
+    term = rng.choice(search_terms)
+    yield _run("admin.search", at, lambda: _widget(at.sidebar.text_input, "🔎 Find course or category").set_value(term))
+
+    sections = _widget(at.sidebar.radio, "Admin Sections").options
+    for section in sections[1:] + sections[:1]:
+        yield _run("admin.section", at, lambda: _widget(at.sidebar.radio, "Admin Sections").set_value(section))
+
+# ======================================================
+# WORKERS
+# ======================================================
+def run_worker(data_dir, sessions, admin_share, marks_moves, seed):
+    from utils.data_loader import load_catalog, use_data_dir
+
+    use_data_dir(data_dir)
+    rng = random.Random(seed)
+    search_terms = [course[:4] for course in list(load_catalog()["eligibility_rules.json"])[:200]] or ["a"]
+
+    # One session first, so imports and the catalog load count as warm-up
+    for _ in student_session(random.Random(seed), 1):
+        pass
+
+    baseline_mb = peak_mb = _rss_mb()
+    live = [
+        admin_session(rng, search_terms) if rng.random() < admin_share else student_session(rng, marks_moves)
+        for _ in range(sessions)
+    ]
+    timings, errors = {}, []
+    started = time.perf_counter()
+    while live:
+        for session in list(live):
+            step = next(session, None)
+            if step is None:
+                live.remove(session)
+                continue
+            name, seconds, error = step
+            timings.setdefault(name, []).append(seconds)
+            if error:
+                errors.append(f"{name}: {error}")
+                live.remove(session)
+        peak_mb = max(peak_mb, _rss_mb())
+    elapsed = time.perf_counter() - started
+
+    reruns = sum(len(seconds) for step, seconds in timings.items() if step != "student.report")
+    return {
+        "timings": timings,
+        "errors": errors,
+        "memory_mb": peak_mb - baseline_mb,
+        "sessions": sessions,
+        "reruns_per_s": reruns / elapsed
+    }
+
+def _percentile(ordered, q):
+    # Nearest rank
+    return ordered[min(len(ordered) - 1, max(0, int(-(-q * len(ordered) // 100)) - 1))]
+
+def _summary(seconds):
+    ordered = sorted(seconds)
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p95_ms": _percentile(ordered, 95) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000
+    }
+
+def run_load(data_dir, sessions, workers, admin_share, marks_moves, seed):
+    shares = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+    jobs = [(data_dir, n, admin_share, marks_moves, seed + i) for i, n in enumerate(shares) if n]
+
+    # Fresh interpreters, so every worker starts as cold as a server process
+    with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+        results = pool.starmap(run_worker, jobs)
+
+    timings = {}
+    for result in results:
+        for step, seconds in result["timings"].items():
+            timings.setdefault(step, []).extend(seconds)
+    reruns = [s for step, seconds in timings.items() if step != "student.report" for s in seconds]
+    errors = [error for result in results for error in result["errors"]]
+
+    return {
+        "steps": {step: _summary(seconds) for step, seconds in sorted(timings.items())},
+        "reruns": _summary(reruns) if reruns else None,
+        # Workers run side by side, so their rates add up
+        "throughput_per_s": sum(r["reruns_per_s"] for r in results),
+        "memory_per_session_mb": sum(r["memory_mb"] for r in results) / sum(r["sessions"] for r in results),
+        "errors": len(errors),
+        "error_samples": errors[:10]
+    }
+
+# ======================================================
+# REPORTING
+# ======================================================
+def _synthetic_catalog(scale, data_dir):
+    write_catalog(generate(**SCALES[scale]), data_dir)
+
+def print_results(results):
+    print(f"{'step':20s} {'count':>7s} {'p50 ms':>10s} {'p95 ms':>10s} {'p99 ms':>10s}")
+    rows = dict(results["steps"])
+    if results["reruns"]:
+        rows["all reruns"] = results["reruns"]
+    for step, s in rows.items():
+        print(f"{step:20s} {s['count']:7d} {s['p50_ms']:10.1f} {s['p95_ms']:10.1f} {s['p99_ms']:10.1f}")
+    print(f"\nThroughput:          {results['throughput_per_s']:.1f} reruns/s")
+    print(f"Memory per session:  {results['memory_per_session_mb']:.2f} MB")
+    if results["errors"]:
+        print(f"Errors:              {results['errors']}")
+        for error in results["error_samples"]:
+            print(f"  {error}")
+
+def compare(current, baseline, tolerance):
+    # (metric, before, after, higher is worse)
+    rows = [
+        (f"{step} p95 ms", s["p95_ms"], current["results"]["steps"][step]["p95_ms"], True)
+        for step, s in baseline["results"]["steps"].items()
+        if step in current["results"]["steps"]
+    ]
+    rows += [
+        ("throughput reruns/s", baseline["results"]["throughput_per_s"], current["results"]["throughput_per_s"], False),
+        ("memory per session MB", baseline["results"]["memory_per_session_mb"], current["results"]["memory_per_session_mb"], True)
+    ]
+
+    regressions = []
+    for metric, before, after, higher_is_worse in rows:
+        ratio = after / before if before else 1.0
+        worse = ratio > 1 + tolerance if higher_is_worse else ratio < 1 / (1 + tolerance)
+        flag = "REGRESSION" if worse else ""
+        print(f"{metric:30s} {before:10.2f} -> {after:10.2f}  x{ratio:5.2f} {flag}")
+        if worse:
+            regressions.append(metric)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the Streamlit pages with simulated sessions.")
+    parser.add_argument("--data-dir", help="Catalog to serve (default: data/); only read")
+    parser.add_argument("--scale", choices=SCALES, help="Serve a synthetic catalog of this size instead")
+    parser.add_argument("--sessions", type=int, default=20, help="Simulated sessions in total")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Worker processes")
+    parser.add_argument("--admin-share", type=float, default=0.1, help="Fraction of sessions that are admins")
+    parser.add_argument("--marks-moves", type=int, default=3, help="Marks slider moves per student session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = args.data_dir or os.path.join(ROOT, "data")
+        if args.scale:
+            data_dir = scratch
+            _synthetic_catalog(args.scale, data_dir)
+        results = run_load(data_dir, args.sessions, max(1, args.workers), args.admin_share, args.marks_moves, args.seed)
+
+    current = {
+        "meta": {
+            "catalog": args.scale or os.path.normpath(data_dir),
+            "sessions": args.sessions,
+            "workers": args.workers,
+            "admin_share": args.admin_share,
+            "marks_moves": args.marks_moves,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    print_results(results)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print()
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions or results["errors"]:
+        sys.exit(f"{len(regressions)} regression(s), {results['errors']} session error(s)")
+
+if __name__ == "__main__":
+    main()
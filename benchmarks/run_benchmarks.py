@@ -0,0 +1,353 @@
+#benchmarks/run_benchmarks.py
+#
+# Times the engine, catalog I/O, the app's table views and PDF
+# rendering against a synthetic catalog:
+#   python -m benchmarks.run_benchmarks --scale medium --out results.json
+#   python -m benchmarks.run_benchmarks --scale medium --save-baseline
+#   python -m benchmarks.run_benchmarks --scale medium   # compares to the baseline
+#
+# Exits non-zero when any benchmark's median is slower than the baseline
+# by more than --tolerance.
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_catalog import SCALES, generate, write_catalog
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+BENCHMARKS = []
+
+def benchmark(name, number=1, repeat=5):
+    # number: operations per timed run; results are reported per operation
+    def register(setup):
+        BENCHMARKS.append((name, setup, number, repeat))
+        return setup
+    return register
+
+def measure(fn, number, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "ops": number * repeat
+    }
+
+# ======================================================
+# BENCHMARKS
+# ======================================================
+# Each setup receives the run context and returns the callable to time.
+
+def _engine():
+    return importlib.import_module("engine.recommendation_engine")
+
+@benchmark("catalog/cold_load_and_build", repeat=3)
+def _cold_load(ctx):
+    from utils import data_loader
+
+    def run():
+        data_loader._stores.clear()
+        importlib.reload(_engine()).get_boards()
+    return run
+
+for _filename in ("boards.json", "streams.json", "course_categories.json", "courses.json", "eligibility_rules.json"):
+    @benchmark(f"io/load_json/{_filename}")
+    def _load(ctx, filename=_filename):
+        from utils.data_loader import load_json
+        return lambda: load_json(filename, ctx["data_dir"])
+
+@benchmark("io/load_compiled_catalog")
+def _load_compiled(ctx):
+    from utils.compiled_catalog import CompiledCatalog
+    from utils.data_loader import CATALOG_FILES, get_store
+    path = get_store(ctx["data_dir"]).compile()
+
+    def run():
+        compiled = CompiledCatalog(path)
+        for filename in CATALOG_FILES:
+            compiled.load(filename)
+    return run
+
+@benchmark("io/open_shared_catalog")
+def _open_shared(ctx):
+    # What a worker in shared mode pays to serve a new catalog version
+    from utils.compiled_catalog import CompiledCatalog
+    from utils.data_loader import CATALOG_FILES, get_store
+    path = get_store(ctx["data_dir"]).compile()
+
+    def run():
+        compiled = CompiledCatalog(path)
+        for filename in CATALOG_FILES:
+            compiled.view(filename)
+    return run
+
+@benchmark("io/save_json/courses.json", repeat=3)
+def _save(ctx):
+    from utils.data_loader import load_json, save_json
+    courses = load_json("courses.json", ctx["data_dir"])
+    return lambda: save_json("courses_copy.json", courses, ctx["data_dir"])
+
+@benchmark("io/journal_commit", number=20)
+def _commit(ctx):
+    from utils.data_loader import commit_changes
+    from utils.journal import set_entry
+    rng = random.Random(1)
+    return lambda: commit_changes([set_entry("eligibility_rules.json", rng.choice(ctx["courses"]), rng.randrange(40, 96))])
+
+@benchmark("engine/incremental_rebuild_after_edit", number=20)
+def _rebuild(ctx):
+    from utils.data_loader import commit_changes
+    from utils.journal import set_entry
+    engine = _engine()
+    rng = random.Random(2)
+
+    def run():
+        commit_changes([set_entry("eligibility_rules.json", rng.choice(ctx["courses"]), rng.randrange(40, 96))])
+        for subject_combo in engine.refresh_catalog():
+            engine.recommend_courses(subject_combo, 75)
+    return run
+
+@benchmark("engine/integrity_after_edit", number=20)
+def _integrity(ctx):
+    from utils.data_loader import commit_changes
+    from utils.journal import set_entry
+    engine = _engine()
+    rng = random.Random(8)
+    engine.integrity_report(limit=0)
+
+    def run():
+        commit_changes([set_entry("eligibility_rules.json", rng.choice(ctx["courses"]), rng.randrange(40, 96))])
+        engine.integrity_report(limit=0)
+    return run
+
+@benchmark("engine/recommend_courses/bucketed", number=20_000)
+def _bucketed(ctx):
+    engine = _engine()
+    combos, rng = ctx["combos"], random.Random(3)
+    queries = [(rng.choice(combos), rng.randrange(40, 101, 5)) for _ in range(1024)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) & 1023
+        engine.recommend_courses(*queries[state["i"]])
+    return run
+
+@benchmark("engine/recommend_courses/exact_marks", number=5_000)
+def _exact(ctx):
+    engine = _engine()
+    combos, rng = ctx["combos"], random.Random(4)
+    queries = [(rng.choice(combos), rng.uniform(40, 100)) for _ in range(1024)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) & 1023
+        engine.recommend_courses(*queries[state["i"]])
+    return run
+
+@benchmark("engine/rank_courses/top_page", number=5_000)
+def _ranked(ctx):
+    engine = _engine()
+    combos, rng = ctx["combos"], random.Random(7)
+    queries = [(rng.choice(combos), rng.randrange(40, 101, 5), rng.randint(1, 3)) for _ in range(1024)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) & 1023
+        combo, marks, page = queries[state["i"]]
+        engine.rank_courses(combo, marks, k=20, page=page)
+    return run
+
+@benchmark("engine/recommend_cohort", repeat=3)
+def _cohort(ctx):
+    import pandas as pd
+    engine = _engine()
+    rng = random.Random(5)
+    paths = [
+        (board, stream, combo)
+        for board, streams in ctx["catalog"]["boards.json"].items()
+        for stream in streams
+        for combo in ctx["catalog"]["streams.json"][stream]
+    ]
+    students = pd.DataFrame(
+        [(*rng.choice(paths), rng.randrange(40, 101)) for _ in range(ctx["students"])],
+        columns=["board", "stream", "subject_combo", "marks"]
+    )
+    return lambda: engine.recommend_cohort(students)
+
+@benchmark("admin/cutoff_whatif", number=200)
+def _whatif(ctx):
+    from engine.cutoff_whatif import CohortMarks
+    engine = _engine()
+    rng = random.Random(9)
+    cohort = CohortMarks(
+        [rng.choice(ctx["combos"]) for _ in range(ctx["students"])],
+        [rng.randrange(40, 101) for _ in range(ctx["students"])]
+    )
+    combos_of = lambda course: engine.course_impact(course)["subject_combos"]
+    courses = rng.sample(ctx["courses"], 200)
+    state = {"i": 0}
+
+    def run():
+        course = courses[state["i"] % len(courses)]
+        state["i"] += 1
+        old = ctx["catalog"]["eligibility_rules.json"][course]
+        cohort.moves({course: (old, old - 5)}, combos_of)
+    return run
+
+@benchmark("engine/search_catalog", number=2_000)
+def _search(ctx):
+    engine = _engine()
+    rng = random.Random(6)
+    queries = []
+    for course in rng.sample(ctx["courses"], 256):
+        queries += [course[:rng.randint(1, len(course))], course.lower(), course[1:]]
+    engine.search_catalog("warm up")
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) % len(queries)
+        engine.search_catalog(queries[state["i"]])
+    return run
+
+# The view builds in app.py, which cannot be imported outside a Streamlit
+# run; a session pays for them on a view cache miss
+@benchmark("app/landscape_table", number=200)
+def _landscape(ctx):
+    import pyarrow as pa
+    engine = _engine()
+    combo = ctx["combos"][0]
+
+    def run():
+        pairs = [(cat, c) for cat in engine.get_course_categories(combo) for c in engine.get_courses(cat)]
+        pa.table({
+            "Category": pa.array([cat for cat, _ in pairs], pa.string()),
+            "Course Name": pa.array([c for _, c in pairs], pa.string())
+        })
+    return run
+
+@benchmark("app/results_view", number=200)
+def _results(ctx):
+    import pyarrow as pa
+    engine = _engine()
+    combo = ctx["combos"][0]
+
+    def run():
+        # First page of both result tables, PAGE_SIZE courses each
+        for buckets in (("best_fit",), ("safe_options", "backup_options")):
+            ranked = engine.rank_courses(combo, 75, buckets, k=20)
+            pa.table({
+                "S.No": pa.array(range(1, len(ranked["courses"]) + 1), pa.int64()),
+                "Course Name": pa.array(ranked["courses"], pa.string())
+            })
+    return run
+
+@benchmark("report/render_pdf", number=20)
+def _pdf(ctx):
+    from engine.report_renderer import render_student_report
+    combo = ctx["combos"][0]
+    return lambda: render_student_report("Benchmark Student", "Board 0", "Stream 0", combo, 75)
+
+# ======================================================
+# RUNNER
+# ======================================================
+def run_all(scale, students, only=None):
+    from utils import data_loader
+
+    sizes = SCALES[scale]
+    catalog = generate(**sizes)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_catalog(catalog, data_dir)
+        data_loader.use_data_dir(data_dir)
+
+        ctx = {
+            "data_dir": data_dir,
+            "catalog": catalog,
+            "combos": list(catalog["course_categories.json"]),
+            "courses": list(catalog["eligibility_rules.json"]),
+            "students": students,
+        }
+        _engine().get_boards()
+
+        results = {}
+        for name, setup, number, repeat in BENCHMARKS:
+            if only and not any(part in name for part in only):
+                continue
+            results[name] = measure(setup(ctx), number, repeat)
+            print(f"{name:45s} {results[name]['median_ms']:12.4f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "scale": scale,
+            "sizes": sizes,
+            "students": students,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:45s} {before['median_ms']:12.4f} -> {result['median_ms']:12.4f} ms  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine against a synthetic catalog.")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--students", type=int, default=100_000, help="Cohort size for recommend_cohort and the cutoff what-if")
+    parser.add_argument("--only", nargs="*", help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    current = run_all(args.scale, args.students, args.only)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"]["scale"] != args.scale:
+        sys.exit(f"Baseline was recorded at scale {baseline['meta']['scale']!r}, not {args.scale!r}")
+
+    if compare(current, baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#benchmarks/synthetic_catalog.py
+#
+# Writes a synthetic catalog in the same five-file layout as data/:
+#   python -m benchmarks.synthetic_catalog /tmp/catalog --courses 100000 --combos 10000
+
+import argparse
+import json
+import os
+import random
+
+# Preset sizes used by the benchmark runner
+SCALES = {
+    "small": {"boards": 3, "streams": 6, "combos": 100, "categories": 300, "courses": 1_000},
+    "medium": {"boards": 10, "streams": 30, "combos": 1_000, "categories": 3_000, "courses": 10_000},
+    "large": {"boards": 40, "streams": 100, "combos": 10_000, "categories": 20_000, "courses": 100_000},
+}
+
+def generate(boards=3, streams=6, combos=100, categories=300, courses=1_000,
+             categories_per_combo=(3, 6), shared_course_ratio=0.1, rule_ratio=0.8, seed=0):
+    rng = random.Random(seed)
+
+    board_names = [f"Board {i}" for i in range(boards)]
+    stream_names = [f"Stream {i}" for i in range(streams)]
+    combo_names = [f"Combo {i}" for i in range(combos)]
+    category_names = [f"Category {i}" for i in range(categories)]
+    course_names = [f"Course {i}" for i in range(courses)]
+
+    boards_json = {
+        board: rng.sample(stream_names, max(1, streams // 2))
+        for board in board_names
+    }
+
+    streams_json = {stream: [] for stream in stream_names}
+    for i, combo in enumerate(combo_names):
+        streams_json[stream_names[i % streams]].append(combo)
+
+    low, high = categories_per_combo
+    course_categories_json = {
+        combo: rng.sample(category_names, min(categories, rng.randint(low, high)))
+        for combo in combo_names
+    }
+
+    # Every course gets a home category; some also appear under a second one,
+    # the way "BBA" sits under both Management and Business
+    courses_json = {category: [] for category in category_names}
+    for i, course in enumerate(course_names):
+        courses_json[category_names[i % categories]].append(course)
+        if rng.random() < shared_course_ratio:
+            courses_json[rng.choice(category_names)].append(course)
+
+    eligibility_json = {
+        course: rng.randrange(40, 96, 5)
+        for course in course_names
+        if rng.random() < rule_ratio
+    }
+
+    return {
+        "boards.json": boards_json,
+        "streams.json": streams_json,
+        "course_categories.json": course_categories_json,
+        "courses.json": courses_json,
+        "eligibility_rules.json": eligibility_json,
+    }
+
+def write_catalog(catalog, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for filename, data in catalog.items():
+        with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic course catalog.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"Override the preset number of {name}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sizes = dict(SCALES[args.scale])
+    sizes.update({name: getattr(args, name) for name in sizes if getattr(args, name) is not None})
+
+    write_catalog(generate(seed=args.seed, **sizes), args.out_dir)
+    print(f"Wrote {sizes} catalog to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
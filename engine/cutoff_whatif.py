@@ -0,0 +1,107 @@
+#engine/cutoff_whatif.py
+
+# What a cutoff change would do to a past cohort of students. The cohort's
+# (subject_combo, marks) records are loaded once into one sorted array,
+# keyed by combo and then marks, so the number of a combo's students at or
+# above any mark is a binary search. A course's buckets are ranges of marks,
+#   backup_options  marks < cutoff
+#   safe_options    cutoff <= marks < cutoff + band
+#   best_fit        marks >= cutoff + band
+# so the students moving from one bucket to another under a new cutoff are
+# those between two thresholds, counted per combo without looking at any
+# student on their own.
+
+import numpy as np
+import pandas as pd
+
+from engine.eligibility_rules import DEFAULT_BAND
+
+COLUMNS = ("subject_combo", "marks")
+
+# Low to high marks, the order the ranges above are in
+BUCKETS = ("backup_options", "safe_options", "best_fit")
+
+# Sort key: combo code * _STRIDE + marks; marks run 0-100, so combos never overlap
+_STRIDE = 1024.0
+_TOP = _STRIDE - 1
+
+def _ranges(cutoffs, bands):
+    # (n, 3) lower and upper bounds of each bucket's marks
+    cutoffs = np.asarray(cutoffs, dtype=np.float64)[:, None]
+    thresholds = cutoffs + np.asarray(bands, dtype=np.float64)[:, None]
+    lower = np.hstack([np.zeros_like(cutoffs), cutoffs, thresholds])
+    upper = np.hstack([cutoffs, thresholds, np.full_like(cutoffs, _TOP)])
+    return lower, upper
+
+class CohortMarks:
+    def __init__(self, subject_combos, marks):
+        codes, combos = pd.factorize(pd.Series(subject_combos, dtype=object))
+        marks = pd.to_numeric(pd.Series(marks), errors="coerce").to_numpy(dtype=np.float64)
+        valid = (codes >= 0) & (marks >= 0) & (marks <= 100)
+
+        self.combos = {combo: code for code, combo in enumerate(combos)}
+        self.skipped = int(len(marks) - valid.sum())
+        self._keys = np.sort(codes[valid] * _STRIDE + marks[valid])
+        self._ends = np.searchsorted(self._keys, (np.arange(len(combos)) + 1) * _STRIDE)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _at_least(self, codes, marks):
+        # Students of each combo with at least the given marks
+        starts = np.searchsorted(self._keys, codes * _STRIDE + np.clip(marks, 0, _TOP))
+        return self._ends[codes] - starts
+
+    def moves(self, changes, combos_of, band_of=lambda course: DEFAULT_BAND):
+        # changes: course -> (old cutoff, new cutoff); combos_of: course ->
+        # subject combos listing it; band_of: course -> its rule's band.
+        # Returns a frame with one row per
+        # (course, combo) with students in the cohort: "students", the
+        # bucket counts before and after, and a column per move between
+        # buckets ("safe_options -> best_fit", ...).
+        pairs = [
+            (course, combo, self.combos[combo], old, new, band)
+            for course, (old, new) in changes.items()
+            for band in (band_of(course),)
+            for combo in combos_of(course)
+            if combo in self.combos
+        ]
+        course_names, combo_names, codes, old, new, bands = (list(column) for column in zip(*pairs)) if pairs else ([],) * 6
+        codes = np.array(codes, dtype=np.int64)
+
+        # A student moves from bucket i to j when their marks are in both
+        # ranges, i.e. between the larger lower bound and the smaller upper one
+        old_lower, old_upper = _ranges(old, bands)
+        new_lower, new_upper = _ranges(new, bands)
+        lower = np.maximum(old_lower[:, :, None], new_lower[:, None, :])
+        upper = np.minimum(old_upper[:, :, None], new_upper[:, None, :])
+        flat = np.repeat(codes, 9)
+        counts = self._at_least(flat, lower.ravel()) - self._at_least(flat, upper.ravel())
+        counts = np.maximum(counts, 0).reshape(-1, 3, 3)
+
+        columns = {
+            "course": course_names,
+            "subject_combo": combo_names,
+            "students": self._ends[codes] - np.searchsorted(self._keys, codes * _STRIDE)
+        }
+        for i, bucket in enumerate(BUCKETS):
+            columns[f"{bucket} before"] = counts[:, i, :].sum(axis=1)
+            columns[f"{bucket} after"] = counts[:, :, i].sum(axis=1)
+        for i, source in enumerate(BUCKETS):
+            for j, target in enumerate(BUCKETS):
+                if i != j:
+                    columns[f"{source} -> {target}"] = counts[:, i, j]
+        return pd.DataFrame(columns)
+
+def read_cohort(f):
+    # CohortMarks from a CSV with subject_combo and marks columns; other
+    # columns are ignored. Raises ValueError when they are missing.
+    try:
+        df = pd.read_csv(f, usecols=lambda name: name.strip().lower() in COLUMNS, dtype=str)
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"Not a readable CSV file: {e}")
+    df.columns = [name.strip().lower() for name in df.columns]
+    missing = [name for name in COLUMNS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return CohortMarks(df["subject_combo"].to_numpy(dtype=object), df["marks"])
@@ -0,0 +1,147 @@
+#engine/eligibility_rules.py
+
+# Eligibility rules, one per course in eligibility_rules.json. A rule is
+# either a number, the minimum percentage, or an object:
+#   "MBBS": {
+#     "min_marks": 90,                       minimum percentage (default 50)
+#     "band": 5,                             best fit from min_marks + band up (default 10)
+#     "boards": {"State Board": 85},         minimum for students of these boards instead
+#     "reservations": {"SC": 10, "OBC": 5},  marks taken off the minimum for these categories
+#     "subjects": {"Biology": 60}            subjects a student needs, with their minimum marks
+#   }
+# A student is best fit at marks >= cutoff + band, safe at marks >= cutoff
+# and backup below it; one missing a required subject is not eligible.
+#
+# compile_rule() checks a rule and turns it into a Rule. A RuleTable packs
+# the rules of many courses into flat arrays, so a batch of (student,
+# course) pairs is classified with array arithmetic: no per-student
+# branches, and no more work for a rich rule than for a plain number.
+
+from functools import lru_cache
+from numbers import Real
+
+DEFAULT_MIN_MARKS = 50
+DEFAULT_BAND = 10
+
+FIELDS = ("min_marks", "band", "boards", "reservations", "subjects")
+
+# Classification codes: RESULT_KEYS order, then students a rule excludes
+BEST_FIT, SAFE, BACKUP, NOT_ELIGIBLE = range(4)
+
+class Rule:
+    # Read-only once built; rules with the same plain cutoff share one
+    __slots__ = FIELDS
+
+    def __init__(self, min_marks=DEFAULT_MIN_MARKS, band=DEFAULT_BAND, boards=None, reservations=None, subjects=None):
+        self.min_marks = min_marks
+        self.band = band
+        self.boards = boards or {}
+        self.reservations = reservations or {}
+        self.subjects = subjects or {}
+
+    def cutoff(self, board=None):
+        return self.boards.get(board, self.min_marks)
+
+DEFAULT_RULE = Rule()
+
+def _percent(value, what):
+    if not isinstance(value, Real) or isinstance(value, bool) or not 0 <= value <= 100:
+        raise ValueError(f"{what} {value!r} is not a number from 0 to 100")
+    return value
+
+def _marks_by_name(rule, field, what):
+    entries = rule.get(field, {})
+    if not isinstance(entries, dict):
+        raise ValueError(f"{field} must map names to numbers, got {entries!r}")
+    return {name: _percent(marks, f"{what} for {name}") for name, marks in entries.items()}
+
+@lru_cache(maxsize=1024)
+def _plain_rule(min_marks):
+    return Rule(min_marks)
+
+def compile_rule(value):
+    # Rule for one eligibility_rules.json value; ValueError says what is wrong
+    if not isinstance(value, dict):
+        _percent(value, "Cutoff")
+        return _plain_rule(value)
+    unknown = value.keys() - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown rule field(s) {', '.join(sorted(unknown))}")
+    return Rule(
+        _percent(value.get("min_marks", DEFAULT_MIN_MARKS), "Cutoff"),
+        _percent(value.get("band", DEFAULT_BAND), "Band"),
+        _marks_by_name(value, "boards", "Cutoff"),
+        _marks_by_name(value, "reservations", "Relief"),
+        _marks_by_name(value, "subjects", "Minimum")
+    )
+
+def base_cutoff(value):
+    # The minimum percentage a rule starts from, as shown and edited by admins
+    return value.get("min_marks", DEFAULT_MIN_MARKS) if isinstance(value, dict) else value
+
+def with_min_marks(value, marks):
+    # value with its minimum percentage replaced, keeping the rest of the rule
+    return dict(value, min_marks=marks) if isinstance(value, dict) else marks
+
+class RuleTable:
+    # rules: one Rule per row. Board minimums, reservations and subject
+    # minimums sit in side tables with a row only for the rules using them;
+    # row 0 and column 0 (an unknown board or category) change nothing.
+    def __init__(self, rules):
+        import numpy as np
+
+        self.boards = sorted({board for rule in rules for board in rule.boards})
+        self.reservations = sorted({name for rule in rules for name in rule.reservations})
+        self.subjects = sorted({subject for rule in rules for subject in rule.subjects})
+
+        self.min_marks = np.array([rule.min_marks for rule in rules], dtype=np.float64)
+        self.band = np.array([rule.band for rule in rules], dtype=np.float64)
+        # One band for all, the usual case, is added as a scalar
+        self._band = self.band[0] if len(rules) and (self.band == self.band[0]).all() else None
+
+        def side_table(field, columns, fill, value):
+            index = {name: i for i, name in enumerate(columns)}
+            users = [i for i, rule in enumerate(rules) if getattr(rule, field)]
+            rows = np.zeros(len(rules), dtype=np.int32)
+            rows[users] = np.arange(1, len(users) + 1)
+            table = np.full((len(users) + 1, len(columns) + 1), fill, dtype=np.float64)
+            for row, i in enumerate(users, start=1):
+                for name, marks in getattr(rules[i], field).items():
+                    table[row, index[name] + 1] = value(rules[i], marks)
+            return rows, table
+
+        # Board minimums as the difference from min_marks, so no board adds 0
+        self._board_rows, self._board_delta = side_table("boards", self.boards, 0.0, lambda rule, marks: marks - rule.min_marks)
+        self._relief_rows, self._relief = side_table("reservations", self.reservations, 0.0, lambda rule, marks: marks)
+        # Subjects a rule does not ask for accept any marks, even none (-inf)
+        self._subject_rows, subject_min = side_table("subjects", self.subjects, -np.inf, lambda rule, marks: marks)
+        self._subject_min = subject_min[:, 1:]
+
+    def codes(self, column, values):
+        # Column codes for board or reservation names: 0 when no rule names it
+        import pandas as pd
+
+        names = self.boards if column == "boards" else self.reservations
+        return pd.Categorical(values, categories=names).codes.astype("int64") + 1
+
+    def classify(self, rules, marks, boards=None, reservations=None, subject_marks=None):
+        # Per (student, course) pair: rule row, marks and, optionally, board
+        # and reservation codes and a (pairs, self.subjects) array of subject
+        # marks, -inf where not taken and inf where not known. Returns
+        # (codes, cutoffs); without subject marks no minimums are checked.
+        import numpy as np
+
+        cutoffs = self.min_marks[rules]
+        if boards is not None and self.boards:
+            cutoffs = cutoffs + self._board_delta[self._board_rows[rules], boards]
+        if reservations is not None and self.reservations:
+            cutoffs = cutoffs - self._relief[self._relief_rows[rules], reservations]
+
+        # Missing marks compare false both times: a backup option
+        band = self.band[rules] if self._band is None else self._band
+        codes = (BACKUP - (marks >= cutoffs) - (marks >= cutoffs + band)).astype(np.int8)
+        if self.subjects and subject_marks is not None:
+            # Rules without subjects have all -inf minimums and always pass
+            met = (subject_marks >= self._subject_min[self._subject_rows[rules]]).all(axis=1)
+            codes = np.where(met, codes, NOT_ELIGIBLE).astype(np.int8)
+        return codes, cutoffs
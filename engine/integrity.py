@@ -0,0 +1,127 @@
+#engine/integrity.py
+
+# Catalog integrity issues, kept per catalog entry so an edit re-checks
+# only the entries it can affect. The catalog is five levels,
+#   board -> stream -> subject combo -> category -> course,
+# each of the first four a file of name -> [names on the next level], plus
+# the eligibility rules for courses. The engine's reverse indexes supply
+# each name's parents.
+#
+# Checks, per entry:
+#   empty           lists nothing on the next level
+#   duplicate       lists the same name twice
+#   dangling        lists a name the next level's file does not have
+#   orphan          no entry on the level above lists it
+#   missing_cutoff  course listed without an eligibility rule
+#   unused_cutoff   eligibility rule for a course no category lists
+#   invalid_cutoff  rule that does not compile; see engine/eligibility_rules.py
+
+import heapq
+from collections import Counter
+from engine.eligibility_rules import compile_rule
+
+LEVELS = ("board", "stream", "subject combo", "category", "course")
+
+COURSE = len(LEVELS) - 1
+
+CHECKS = (
+    "dangling",
+    "missing_cutoff",
+    "invalid_cutoff",
+    "duplicate",
+    "orphan",
+    "empty",
+    "unused_cutoff",
+)
+
+class CatalogIssues:
+    def __init__(self, default_min_marks):
+        self.default_min_marks = default_min_marks
+        self._issues = {}         # (level, name) -> [(check, detail)]
+        self.counts = Counter()   # check -> issues
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def _entry_issues(self, level, name, lists, eligibility, parents):
+        found = []
+        if level == COURSE:
+            listed = bool(parents[level].get(name))
+            if name not in eligibility:
+                if listed:
+                    found.append(("missing_cutoff", f"No eligibility rule; recommended as if it were {self.default_min_marks}%"))
+                return found
+            try:
+                compile_rule(eligibility[name])
+            except ValueError as e:
+                found.append(("invalid_cutoff", str(e)))
+            if not listed:
+                found.append(("unused_cutoff", "Eligibility rule for a course no category lists"))
+            return found
+
+        if name not in lists[level]:
+            return found
+        children = lists[level][name]
+        if not children:
+            found.append(("empty", f"Lists no {LEVELS[level + 1]}"))
+        if len(set(children)) < len(children):
+            twice = [child for child, n in Counter(children).items() if n > 1]
+            found.append(("duplicate", f"Lists {', '.join(twice)} more than once"))
+        if level + 1 < COURSE:
+            missing = [child for child in dict.fromkeys(children) if child not in lists[level + 1]]
+            if missing:
+                found.append(("dangling", f"Lists {LEVELS[level + 1]} {', '.join(missing)}, which does not exist"))
+        if level and not parents[level].get(name):
+            found.append(("orphan", f"No {LEVELS[level - 1]} lists it"))
+        return found
+
+    def check(self, entries, lists, eligibility, parents):
+        # Re-check the given (level, name) entries against the current
+        # catalog. lists: the four files in level order; parents: level ->
+        # {name: names on the level above listing it} (parents[0] unused).
+        for entry in entries:
+            for check, _ in self._issues.pop(entry, ()):
+                self.counts[check] -= 1
+            found = self._entry_issues(*entry, lists, eligibility, parents)
+            if found:
+                self._issues[entry] = found
+                self.counts.update(check for check, _ in found)
+        self.counts = +self.counts
+
+    def check_all(self, lists, eligibility, parents):
+        self._issues.clear()
+        self.counts.clear()
+        entries = [(level, name) for level, data in enumerate(lists) for name in data]
+        entries += [(COURSE, course) for course in parents[COURSE].keys() | eligibility.keys()]
+        self.check(entries, lists, eligibility, parents)
+
+    def affected(self, level, changed, old, new, parents):
+        # Entries whose issues can move when the keys in changed are edited
+        # in level's file (COURSE: the eligibility rules); parents as updated
+        entries = {(level, name) for name in changed}
+        if level == COURSE:
+            return entries
+        for name in changed:
+            # Children gained or lost a parent; parents may now list a missing name
+            for child in set(old.get(name, ())) | set(new.get(name, ())):
+                entries.add((level + 1, child))
+            if level:
+                entries.update((level - 1, parent) for parent in parents[level].get(name, ()))
+        return entries
+
+    def issues(self, limit=None):
+        # [{"check", "level", "name", "detail"}], worst checks first
+        if limit == 0:
+            return []
+        rank = {check: i for i, check in enumerate(CHECKS)}
+        issues = (
+            (rank[check], level, name, check, detail)
+            for (level, name), found in self._issues.items()
+            for check, detail in found
+        )
+        key = lambda issue: issue[:3]
+        ordered = sorted(issues, key=key) if limit is None else heapq.nsmallest(limit, issues, key=key)
+        return [
+            {"check": check, "level": LEVELS[level], "name": name, "detail": detail}
+            for _, level, name, check, detail in ordered
+        ]
@@ -0,0 +1,39 @@
+#engine/name_table.py
+
+# Integer IDs for catalog names. Each name is held once, in an array
+# indexed by ID, and keeps its ID for the life of the process across
+# catalog edits: IDs are never reused, so a name dropped from the catalog
+# keeps its slot. IDs are not persisted and differ between processes.
+
+import threading
+
+class NameTable:
+    __slots__ = ("_ids", "names", "_lock")
+
+    def __init__(self):
+        self._ids = {}       # name -> id
+        self.names = []      # id -> name
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, name):
+        # ID of an interned name, or None
+        return self._ids.get(name)
+
+    def id(self, name):
+        i = self._ids.get(name)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(name)
+                if i is None:
+                    # Name first, so an ID is never seen before its slot exists
+                    i = len(self.names)
+                    self.names.append(name)
+                    self._ids[name] = i
+        return i
+
+    def unique_ids(self, names):
+        # IDs of names, each once, in the order first seen
+        return list(dict.fromkeys(map(self.id, names)))
@@ -1,37 +1,741 @@
 #engine/recommendation_engine.py
 
-from utils.data_loader import load_json
+import heapq
+import threading
+import weakref
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from engine.eligibility_rules import DEFAULT_BAND, DEFAULT_MIN_MARKS, DEFAULT_RULE, NOT_ELIGIBLE, RuleTable, base_cutoff, compile_rule
+from engine.integrity import CHECKS, COURSE, CatalogIssues
+from engine.name_table import NameTable
+from engine.search_index import SearchIndex
+from utils.compiled_catalog import Overlay, edited_between
+from utils.data_loader import LINK_FILES, SHARED_CATALOG, get_store, parents_of
+from utils.metrics import incr, timed_function
 
-boards = load_json("boards.json")
-streams = load_json("streams.json")
-course_categories = load_json("course_categories.json")
-courses = load_json("courses.json")
-eligibility = load_json("eligibility_rules.json")
+# Band of courses without a rule of their own; see engine/eligibility_rules.py
+BEST_FIT_MARGIN = DEFAULT_BAND
+
+# Same values the marks slider in app.py offers (40-100, step 5)
+MARK_BUCKETS = tuple(range(40, 101, 5))
+
+RESULT_KEYS = ("best_fit", "safe_options", "backup_options")
+
+# ======================================================
+# ENGINE STATE
+# ======================================================
+# One per catalog store, so per tenant (see utils/data_loader.py): the
+# catalog as last synced and everything built from it. Each function works
+# on the store get_store() gives its caller, and a store's state goes with
+# it when the store is evicted.
+class _Catalog:
+    def __init__(self):
+        # Current catalog, swapped in from the store by _sync()
+        self.boards = {}
+        self.streams = {}
+        self.course_categories = {}
+        self.courses = {}
+        self.eligibility = {}
+
+        # Store version the catalog was last synced to
+        self.version = None
+        self.lock = threading.Lock()
+
+        # Course and category IDs used by the tables below; see engine/name_table.py
+        self.course_names = NameTable()
+        self.category_names = NameTable()
+
+        self.table = {}
+        self.ladders = {}
+        self.combo_boards = {}
+        self.rankings = {}
+        self.table_version = 0
+
+        self.course_to_categories = _new_index()
+        self.category_to_combos = _new_index()
+        self.combo_to_streams = _new_index()
+        self.stream_to_boards = _new_index()
+
+        self.search_index = None
+        self.integrity = None
+        self.cohort_arrays = {"version": None}
+
+_catalogs = weakref.WeakKeyDictionary()   # store -> _Catalog
+_catalogs_lock = threading.Lock()
+
+def _current():
+    store = get_store()
+    catalog = _catalogs.get(store)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(store)
+            if catalog is None:
+                catalog = _catalogs[store] = _Catalog()
+    return store, catalog
+
+def course_id(course):
+    return _current()[1].course_names.get(course)
+
+def course_name(course_id):
+    return _current()[1].course_names.names[course_id]
+
+def _rule(c, course):
+    value = c.eligibility.get(course)
+    if value is None:
+        return DEFAULT_RULE
+    try:
+        return compile_rule(value)
+    except ValueError:
+        # Reported by integrity_report(); the default applies meanwhile
+        return DEFAULT_RULE
+
+def course_rule(course):
+    # The course's compiled eligibility Rule
+    return _rule(_sync(), course)
+
+# ======================================================
+# MATERIALIZED RECOMMENDATION TABLE
+# ======================================================
+# Filled one combo at a time, on the combo's first request. Courses are
+# held as IDs, each once per combo, in the order first listed for it.
+# board is None for the combo's base rules, or a board some of its rules
+# set their own cutoff for; students of other boards use the base tables.
+#   table:        (subject_combo, board, bucket) -> (best_fit, safe_options,
+#                 backup_options) ID tuples
+#   ladders:      (subject_combo, board) -> (cutoffs sorted ascending,
+#                 positions in the same order, best fit thresholds sorted
+#                 ascending, positions in that order, course IDs by
+#                 position), as arrays
+#   combo_boards: subject_combo -> boards its courses' rules name, recorded
+#                 by its base build
+
+def get_boards():
+    return list(_sync().boards)
 
 def get_streams_by_board(board):
-    return boards.get(board, [])
+    return _sync().boards.get(board, [])
 
 def get_subject_combinations(stream):
-    return streams.get(stream, [])
+    return _sync().streams.get(stream, [])
 
 def get_course_categories(subject_combo):
-    return course_categories.get(subject_combo, [])
+    return _sync().course_categories.get(subject_combo, [])
+
+def get_courses(category):
+    return _sync().courses.get(category, [])
+
+def _combo_course_ids(c, subject_combo):
+    # A course listed under several of the combo's categories counts once
+    return c.course_names.unique_ids(
+        course
+        for category in c.course_categories.get(subject_combo, [])
+        for course in c.courses.get(category, [])
+    )
+
+def _classify(combo_courses, cutoffs, thresholds, marks):
+    best_fit, safe, backup = [], [], []
+    for course, min_marks, threshold in zip(combo_courses, cutoffs, thresholds):
+        if marks >= threshold:
+            best_fit.append(course)
+        elif marks >= min_marks:
+            safe.append(course)
+        else:
+            backup.append(course)
+    return tuple(best_fit), tuple(safe), tuple(backup)
+
+def _combo_rules(c, subject_combo, board, course_ids):
+    # Compiled once per build; the shared catalog answers each lookup from the image
+    names = c.course_names.names
+    rules = [_rule(c, names[course]) for course in course_ids]
+    if board is None:
+        c.combo_boards[subject_combo] = frozenset(name for rule in rules for name in rule.boards)
+    return rules
+
+def _variant(c, subject_combo, board):
+    # The board whose tables serve a student of board
+    if board is None:
+        return None
+    return board if board in c.combo_boards.get(subject_combo, ()) else None
+
+def _build_combo(c, subject_combo, board):
+    incr("engine.combos_built")
+    combo_courses = _combo_course_ids(c, subject_combo)
+    rules = _combo_rules(c, subject_combo, board, combo_courses)
+    cutoffs = [rule.cutoff(board) for rule in rules]
+    thresholds = [cutoff + rule.band for cutoff, rule in zip(cutoffs, rules)]
+
+    # Stable, so equal cutoffs keep catalog order. With one band for all,
+    # thresholds sort the same way.
+    order = array("i", sorted(range(len(combo_courses)), key=cutoffs.__getitem__))
+    uniform = len({rule.band for rule in rules}) <= 1
+    best_order = order if uniform else array("i", sorted(range(len(combo_courses)), key=thresholds.__getitem__))
+
+    for bucket in MARK_BUCKETS:
+        c.table[(subject_combo, board, bucket)] = _classify(combo_courses, cutoffs, thresholds, bucket)
+
+    # Stored last: a ladder means the combo's buckets are all in place
+    ladder = c.ladders[(subject_combo, board)] = (
+        array("d", [cutoffs[i] for i in order]),
+        order,
+        array("d", [thresholds[i] for i in best_order]),
+        best_order,
+        array("i", combo_courses)
+    )
+    return ladder
+
+def _drop_combo(c, subject_combo):
+    for board in (None, *c.combo_boards.pop(subject_combo, ())):
+        c.ladders.pop((subject_combo, board), None)
+        c.rankings.pop((subject_combo, board), None)
+        for bucket in MARK_BUCKETS:
+            c.table.pop((subject_combo, board, bucket), None)
+
+def _invalidate_combos(c, subject_combos):
+    # Each combo is rebuilt by _combo_ladder() on its next request, so a
+    # fresh worker or a catalog-wide edit pays only for combos in use
+    incr("engine.combos_invalidated", len(subject_combos))
+
+    for subject_combo in subject_combos:
+        _drop_combo(c, subject_combo)
+
+    c.table_version += 1
+
+def _combo_entry(c, built, build, subject_combo, board):
+    # built: c.ladders or c.rankings. The base entry goes first, as it
+    # records which boards get their own.
+    entry = built.get((subject_combo, _variant(c, subject_combo, board)))
+    if entry is None and subject_combo in c.course_categories:
+        # Under the sync lock so a refresh cannot drop the combo mid-build
+        with c.lock:
+            if subject_combo in c.course_categories:
+                if (subject_combo, None) not in built:
+                    build(c, subject_combo, None)
+                key = (subject_combo, _variant(c, subject_combo, board))
+                entry = built.get(key) or build(c, *key)
+    return entry
+
+def _combo_ladder(c, subject_combo, board=None):
+    return _combo_entry(c, c.ladders, _build_combo, subject_combo, board)
+
+# ======================================================
+# REVERSE INDEXES
+# ======================================================
+# Kept in step with the catalog by refresh_catalog(), one changed key at a time.
+# With a shared catalog they are overlays over the parents indexes published
+# with it, so only edits made since the last publish take memory here.
+_NO_PARENTS = {}
+
+def _new_index():
+    return Overlay(_NO_PARENTS, factory=set) if SHARED_CATALOG else {}
+
+def _changed_keys(old, new, keys=None):
+    # keys: those the store logged as changed; without them, whole files
+    # are compared
+    if keys is None:
+        if old is new:
+            return set()
+        if not old:
+            return set(new)
+        keys = edited_between(old, new)
+        if keys is None:
+            keys = old.keys() | new.keys()
+    return {k for k in keys if old.get(k) != new.get(k)}
+
+def _holders(index, items):
+    return {holder for item in items for holder in index.get(item, ())}
+
+def _update_index(index, changed, old, new):
+    # index maps each listed item back to the keys whose list contains it
+    for key in changed:
+        old_items = set(old.get(key, ()))
+        new_items = set(new.get(key, ()))
+        for item in old_items - new_items:
+            holders = index[item]
+            holders.discard(key)
+            if not holders:
+                del index[item]
+        for item in new_items - old_items:
+            index.setdefault(item, set()).add(key)
+
+def _update_indexes(catalog, changes):
+    # changes: (index, changed keys, old data, new data) per link file
+    parents = parents_of(catalog) if SHARED_CATALOG else None
+    for filename, (index, changed, old, new) in zip(LINK_FILES, changes):
+        if not SHARED_CATALOG or index.base is (parents[filename] if parents else _NO_PARENTS):
+            _update_index(index, changed, old, new)
+        elif parents:
+            # A newly published catalog: its own index, plus edits made since
+            index.rebase(parents[filename])
+            _update_index(index, new.edited(), new.base, new)
+        else:
+            index.rebase(_NO_PARENTS)
+            _update_index(index, set(new), {}, new)
+
+@timed_function("engine.catalog_sync")
+def _refresh(store, c):
+    # Pick up the keys the store changed and invalidate only the combos they
+    # can reach. Reverse indexes are looked up before and after they are
+    # updated so that both removed and added links count.
+    with c.lock:
+        catalog, version, changes = store.load_since(c.version)
+        if version == c.version:
+            return set()
+        # Files the store reloaded whole, or all of them when its log does
+        # not reach back to the last sync, are compared key by key
+        logged = (lambda filename: None) if changes is None else (lambda filename: changes.get(filename, ()))
+
+        new_boards = catalog["boards.json"]
+        new_streams = catalog["streams.json"]
+        new_categories = catalog["course_categories.json"]
+        new_courses = catalog["courses.json"]
+        new_eligibility = catalog["eligibility_rules.json"]
+
+        # The first sync affects every combo; skip looking them up
+        initial = c.version is None
+
+        changed_courses = _changed_keys(c.courses, new_courses, logged("courses.json"))
+        changed_combos = _changed_keys(c.course_categories, new_categories, logged("course_categories.json"))
+        touched_courses = set() if initial else _changed_keys(c.eligibility, new_eligibility, logged("eligibility_rules.json"))
+
+        touched_categories = changed_courses | _holders(c.course_to_categories, touched_courses)
+        affected = changed_combos | _holders(c.category_to_combos, touched_categories)
+
+        changed_streams = _changed_keys(c.streams, new_streams, logged("streams.json"))
+        changed_boards = _changed_keys(c.boards, new_boards, logged("boards.json"))
+
+        _update_indexes(catalog, (
+            (c.stream_to_boards, changed_boards, c.boards, new_boards),
+            (c.combo_to_streams, changed_streams, c.streams, new_streams),
+            (c.category_to_combos, changed_combos, c.course_categories, new_categories),
+            (c.course_to_categories, changed_courses, c.courses, new_courses)
+        ))
+        _update_search(c, changed_courses, c.courses, new_courses)
+
+        if not initial:
+            touched_categories |= _holders(c.course_to_categories, touched_courses)
+            affected |= _holders(c.category_to_combos, touched_categories)
+        changed = initial or bool(affected or changed_boards or changed_streams)
+
+        old_boards, old_streams, old_categories, old_courses = c.boards, c.streams, c.course_categories, c.courses
+        c.boards = new_boards
+        c.streams = new_streams
+        c.course_categories = new_categories
+        c.courses = new_courses
+        c.eligibility = new_eligibility
+        c.version = version
+
+        _update_integrity(c, (
+            (0, changed_boards, old_boards, new_boards),
+            (1, changed_streams, old_streams, new_streams),
+            (2, changed_combos, old_categories, new_categories),
+            (3, changed_courses, old_courses, new_courses),
+            (COURSE, touched_courses, None, None)
+        ))
+
+        # Board/stream edits invalidate nothing but still move the version,
+        # since the cohort path check depends on them
+        if changed:
+            _invalidate_combos(c, affected)
 
-def recommend_courses(subject_combo, marks):
-    result = {
-        "best_fit": [],
-        "safe_options": [],
-        "backup_options": []
+    return affected
+
+def refresh_catalog():
+    # Subject combos the sync invalidated
+    return _refresh(*_current())
+
+def _sync():
+    # Every engine call syncs; the store's files are checked at most once
+    # per CHECK_INTERVAL (see utils/data_loader.py)
+    store, c = _current()
+    store.refresh_if_stale()
+    if store.version != c.version:
+        _refresh(store, c)
+    return c
+
+def _recommend_from_ladder(ladder, marks):
+    if ladder is None:
+        return (), (), ()
+
+    cutoffs, order, thresholds, best_order, combo_courses = ladder
+    safe_end = bisect_right(cutoffs, marks)
+    best = set(best_order[:bisect_right(thresholds, marks)])
+
+    # Slices come out in cutoff order; put them back into catalog order
+    return tuple(
+        tuple(combo_courses[position] for position in sorted(part))
+        for part in (best, [p for p in order[:safe_end] if p not in best], order[safe_end:])
+    )
+
+@timed_function("engine.recommend_courses")
+def recommend_courses(subject_combo, marks, ids=False, board=None):
+    # Course names per bucket, or with ids=True their IDs (see course_name()).
+    # board: the student's, for rules with board cutoffs.
+    c = _sync()
+    lists = c.table.get((subject_combo, _variant(c, subject_combo, board), marks))
+    if lists is None:
+        ladder = _combo_ladder(c, subject_combo, board)
+        lists = c.table.get((subject_combo, _variant(c, subject_combo, board), marks))
+        if lists is None:
+            incr("engine.ladder_lookups")
+            lists = _recommend_from_ladder(ladder, marks)
+
+    if ids:
+        return {key: list(values) for key, values in zip(RESULT_KEYS, lists)}
+    names = c.course_names.names
+    return {key: [names[course] for course in values] for key, values in zip(RESULT_KEYS, lists)}
+
+# ======================================================
+# RANKED (TOP-K) RECOMMENDATIONS
+# ======================================================
+# score = marks over the cutoff
+#       + CATEGORY_WEIGHT scaled by how early the category is listed for the combo
+#       + POPULARITY_WEIGHT * popularity (optional, course -> 0..1)
+CATEGORY_WEIGHT = 5
+POPULARITY_WEIGHT = 10
+
+# rankings: (subject_combo, board) -> (cutoffs sorted ascending, positions,
+# course IDs, category bonuses, bands) as arrays in the same order, one
+# entry per course; built on first request like ladders
+
+def _build_ranking(c, subject_combo, board):
+    categories = c.course_categories.get(subject_combo, [])
+    entries = {}   # course ID -> (position, category bonus)
+    position = 0
+    for i, category in enumerate(categories):
+        bonus = CATEGORY_WEIGHT * (len(categories) - i) / len(categories)
+        for course in map(c.course_names.id, c.courses.get(category, [])):
+            # A course under several categories keeps its earliest, highest-weighted one
+            if course not in entries:
+                entries[course] = (position, bonus)
+            position += 1
+
+    rules = dict(zip(entries, _combo_rules(c, subject_combo, board, entries)))
+    cutoffs = {course: rule.cutoff(board) for course, rule in rules.items()}
+    # Stable, so equal cutoffs keep catalog order
+    ranked = sorted(entries, key=cutoffs.__getitem__)
+    ranking = c.rankings[(subject_combo, board)] = (
+        array("d", [cutoffs[course] for course in ranked]),
+        array("i", [entries[course][0] for course in ranked]),
+        array("i", ranked),
+        array("d", [entries[course][1] for course in ranked]),
+        array("d", [rules[course].band for course in ranked])
+    )
+    return ranking
+
+def _combo_ranking(c, subject_combo, board=None):
+    return _combo_entry(c, c.rankings, _build_ranking, subject_combo, board)
+
+@timed_function("engine.rank_courses")
+def rank_courses(subject_combo, marks, buckets=RESULT_KEYS, k=10, page=1, popularity=None, board=None):
+    # One page of the best-scoring courses across the given buckets. Backup
+    # options are the tail of the cutoff-sorted ranking and the eligible
+    # courses the head, split by each one's band; a bounded heap picks the
+    # page out of them without sorting the rest.
+    c = _sync()
+    cutoffs, positions, ranked, bonuses, bands = _combo_ranking(c, subject_combo, board) or ((), (), (), (), ())
+
+    safe_end = bisect_right(cutoffs, marks)
+    best = "best_fit" in buckets
+    if best == ("safe_options" in buckets):
+        eligible = range(safe_end if best else 0)
+    else:
+        eligible = [i for i in range(safe_end) if (marks >= cutoffs[i] + bands[i]) == best]
+    backup = range(safe_end, len(ranked)) if "backup_options" in buckets else range(0)
+
+    total = len(eligible) + len(backup)
+    pages = max(1, -(-total // k))
+    page = min(max(1, page), pages)
+    popularity = popularity or {}
+    names = c.course_names.names
+
+    def score(i):
+        return marks - cutoffs[i] + bonuses[i] + POPULARITY_WEIGHT * popularity.get(names[ranked[i]], 0)
+
+    # Ties keep catalog order
+    top = heapq.nlargest(
+        page * k,
+        chain(eligible, backup),
+        key=lambda i: (score(i), -positions[i])
+    )[(page - 1) * k:]
+
+    return {
+        "courses": [names[ranked[i]] for i in top],
+        "ids": [ranked[i] for i in top],
+        "scores": [round(score(i), 2) for i in top],
+        "total": total,
+        "page": page,
+        "pages": pages
     }
 
-    for category in course_categories.get(subject_combo, []):
-        for course in courses.get(category, []):
-            min_marks = eligibility.get(course, 50)
-            if marks >= min_marks + 10:
-                result["best_fit"].append(course)
-            elif marks >= min_marks:
-                result["safe_options"].append(course)
+# ======================================================
+# IMPACT ANALYSIS
+# ======================================================
+def _reach(c, categories):
+    subject_combos = _holders(c.category_to_combos, categories)
+    stream_names = _holders(c.combo_to_streams, subject_combos)
+    return {
+        "categories": sorted(categories),
+        "subject_combos": sorted(subject_combos),
+        "streams": sorted(stream_names),
+        "boards": sorted(_holders(c.stream_to_boards, stream_names))
+    }
+
+def course_impact(course):
+    # Everything a student could reach this course through
+    c = _sync()
+    return _reach(c, set(c.course_to_categories.get(course, ())))
+
+def category_impact(category):
+    return _reach(_sync(), {category})
+
+def orphans_after_combo_delete(subject_combo, stream):
+    # What deleting subject_combo from stream leaves unreachable. A combo
+    # still listed under another stream keeps its categories.
+    c = _sync()
+    if c.combo_to_streams.get(subject_combo, set()) - {stream}:
+        return {"categories": [], "courses": []}
+
+    categories = [
+        category
+        for category in dict.fromkeys(c.course_categories.get(subject_combo, []))
+        if c.category_to_combos.get(category, set()) <= {subject_combo}
+    ]
+    gone = set(categories)
+    orphan_courses = [
+        course
+        for category in categories
+        for course in dict.fromkeys(c.courses.get(category, []))
+        if c.course_to_categories.get(course, set()) <= gone
+    ]
+    return {"categories": categories, "courses": list(dict.fromkeys(orphan_courses))}
+
+# ======================================================
+# SEARCH
+# ======================================================
+# Course and category names, built on the first search and then updated by
+# refresh_catalog() for just the categories an edit touched
+
+def _update_search(c, changed_categories, old_courses, new_courses):
+    index = c.search_index
+    if index is None:
+        return
+    for category in changed_categories:
+        if category in new_courses:
+            index.add("category", category)
+        else:
+            index.remove("category", category)
+        for course in set(old_courses.get(category, ())) ^ set(new_courses.get(category, ())):
+            if course in c.course_to_categories:
+                index.add("course", course)
             else:
-                result["backup_options"].append(course)
+                index.remove("course", course)
+
+def search_catalog(query, limit=10):
+    c = _sync()
+    with c.lock:
+        if c.search_index is None:
+            index = SearchIndex()
+            for category in c.courses:
+                index.add("category", category)
+            for course in c.course_to_categories:
+                index.add("course", course)
+            c.search_index = index
+        hits = c.search_index.search(query, limit)
+
+    results = []
+    for kind, name in hits:
+        categories = sorted(c.course_to_categories.get(name, ())) if kind == "course" else [name]
+        results.append({
+            "kind": kind,
+            "name": name,
+            "categories": categories,
+            "subject_combos": sorted(_holders(c.category_to_combos, categories)),
+            "min_marks": base_cutoff(c.eligibility.get(name, DEFAULT_MIN_MARKS)) if kind == "course" else None
+        })
+    return results
+
+# ======================================================
+# INTEGRITY
+# ======================================================
+# Built by the first integrity_report(), then re-checked by refresh_catalog()
+# for just the entries an edit can affect
+
+def _integrity_args(c):
+    return (
+        (c.boards, c.streams, c.course_categories, c.courses),
+        c.eligibility,
+        (None, c.stream_to_boards, c.combo_to_streams, c.category_to_combos, c.course_to_categories)
+    )
+
+def _update_integrity(c, changes):
+    if c.integrity is None:
+        return
+    entries = set()
+    for level, changed, old, new in changes:
+        entries |= c.integrity.affected(level, changed, old, new, _integrity_args(c)[2])
+    c.integrity.check(entries, *_integrity_args(c))
+
+@timed_function("engine.integrity_report")
+def integrity_report(limit=None):
+    # {"counts": {check: n}, "issues": [...]} for the current catalog; see
+    # engine/integrity.py for the checks
+    c = _sync()
+    with c.lock:
+        if c.integrity is None:
+            checker = CatalogIssues(DEFAULT_MIN_MARKS)
+            checker.check_all(*_integrity_args(c))
+            c.integrity = checker
+        counts = {check: c.integrity.counts[check] for check in CHECKS if c.integrity.counts[check]}
+        return {"counts": counts, "issues": c.integrity.issues(limit)}
+
+# ======================================================
+# COHORT (BULK) RECOMMENDATIONS
+# ======================================================
+def _path_key(board_code, stream_code, combo_code, n_streams, n_combos):
+    return (board_code * n_streams + stream_code) * n_combos + combo_code
+
+def _get_cohort_arrays(c):
+    # Flattened (combo, category ID, course ID, rule row) pairs in catalog
+    # order, rebuilt only when the table version moves. A course listed under
+    # several of a combo's categories is paired once, with the first, as
+    # recommend_courses() lists it once. Each course's rule is compiled
+    # once, into a RuleTable row.
+    import numpy as np
+
+    cohort_arrays = c.cohort_arrays
+    if cohort_arrays["version"] == c.table_version:
+        return cohort_arrays
+
+    combos = list(c.course_categories)
+    combo_ids = {subject_combo: i for i, subject_combo in enumerate(combos)}
+    board_names = list(c.boards)
+    stream_names = list(c.streams)
+    stream_ids = {stream: i for i, stream in enumerate(stream_names)}
+    counts, pair_categories, pair_courses, pair_rules = [], [], [], []
+    rule_rows, rules = {}, []   # course ID -> row in rules
+    for subject_combo in combos:
+        start = len(pair_courses)
+        paired = set()
+        for category in c.course_categories[subject_combo]:
+            category_id = c.category_names.id(category)
+            for course in c.courses.get(category, []):
+                course_id = c.course_names.id(course)
+                if course_id in paired:
+                    continue
+                paired.add(course_id)
+                row = rule_rows.get(course_id)
+                if row is None:
+                    row = rule_rows[course_id] = len(rules)
+                    rules.append(_rule(c, course))
+                pair_categories.append(category_id)
+                pair_courses.append(course_id)
+                pair_rules.append(row)
+        counts.append(len(pair_courses) - start)
+
+    counts = np.array(counts, dtype=np.int64)
+    cohort_arrays.update(
+        version=c.table_version,
+        combos=combos,
+        boards=board_names,
+        streams=stream_names,
+        paths=np.unique(np.array([
+            _path_key(b, stream_ids[stream], combo_ids[subject_combo], len(stream_names), len(combos))
+            for b, board in enumerate(board_names)
+            for stream in c.boards[board] if stream in stream_ids
+            for subject_combo in c.streams[stream] if subject_combo in combo_ids
+        ], dtype=np.int64)),
+        counts=counts,
+        offsets=np.cumsum(counts) - counts,
+        categories=np.array(pair_categories, dtype=np.int32),
+        courses=np.array(pair_courses, dtype=np.int32),
+        category_names=np.array(c.category_names.names, dtype=object),
+        course_names=np.array(c.course_names.names, dtype=object),
+        rules=RuleTable(rules),
+        pair_rules=np.array(pair_rules, dtype=np.int32),
+    )
+    return cohort_arrays
+
+def cohort_marks(marks):
+    # A marks column as float64, NaN where a mark is blank, not a number or
+    # outside 0-100
+    import numpy as np
+    import pandas as pd
+
+    marks = pd.to_numeric(pd.Series(marks), errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    marks[~((marks >= 0) & (marks <= 100))] = np.nan
+    return marks
+
+def _cohort_combos(arrays, df):
+    # Each student's combo code, -1 where the board/stream/subject_combo
+    # path is not in the catalog
+    import numpy as np
+    import pandas as pd
+
+    board_codes, stream_codes, combo_codes = (
+        pd.Categorical(df[column], categories=arrays[key]).codes.astype(np.int64)
+        for column, key in (("board", "boards"), ("stream", "streams"), ("subject_combo", "combos"))
+    )
+    path_keys = _path_key(board_codes, stream_codes, combo_codes, len(arrays["streams"]), len(arrays["combos"]))
+    on_path = (board_codes >= 0) & (stream_codes >= 0) & (combo_codes >= 0)
+    on_path &= np.isin(path_keys, arrays["paths"])
+    combo_codes[~on_path] = -1
+    return combo_codes
+
+def cohort_on_path(df):
+    # Per student, whether their board/stream/subject_combo path is in the catalog
+    return _cohort_combos(_get_cohort_arrays(_sync()), df) >= 0
+
+@timed_function("engine.recommend_cohort")
+def recommend_cohort(df):
+    # One output row per (student, reachable course), under the first of
+    # the combo's categories listing the course. Students whose
+    # board/stream/subject_combo path is not in the catalog, or whose marks
+    # cohort_marks() rejects, get no rows, nor do courses a rule excludes
+    # them from. Rules can also look at optional columns:
+    # "reservation" (the student's category) and "marks_<subject>"
+    # for the subjects they set a minimum for; subjects without a column
+    # are not checked, and a blank mark means the subject was not taken.
+    import numpy as np
+    import pandas as pd
+
+    arrays = _get_cohort_arrays(_sync())
+
+    combo_codes = _cohort_combos(arrays, df)
+    student_marks = cohort_marks(df["marks"])
+    combo_codes[np.isnan(student_marks)] = -1
+    known = combo_codes >= 0
+
+    per_student = np.where(known, arrays["counts"][np.where(known, combo_codes, 0)], 0)
+    total = int(per_student.sum())
+
+    student = np.repeat(np.arange(len(df)), per_student)
+    first_of_student = np.repeat(np.cumsum(per_student) - per_student, per_student)
+    pair = np.repeat(arrays["offsets"][np.where(known, combo_codes, 0)], per_student)
+    pair += np.arange(total) - first_of_student
+
+    table = arrays["rules"]
+    board_column = table.codes("boards", df["board"])[student] if table.boards else None
+    reservations = None
+    if table.reservations and "reservation" in df:
+        reservations = table.codes("reservations", df["reservation"])[student]
+    subject_marks = None
+    if any(f"marks_{subject}" in df for subject in table.subjects):
+        subject_marks = np.column_stack([
+            pd.to_numeric(df[f"marks_{subject}"], errors="coerce").fillna(-np.inf).to_numpy(dtype=np.float64)
+            if f"marks_{subject}" in df else np.full(len(df), np.inf)
+            for subject in table.subjects
+        ])[student]
+
+    marks = student_marks[student]
+    bucket_codes, cutoffs = table.classify(arrays["pair_rules"][pair], marks, board_column, reservations, subject_marks)
+    kept = bucket_codes != NOT_ELIGIBLE
+    if not kept.all():
+        student, pair, bucket_codes, cutoffs = student[kept], pair[kept], bucket_codes[kept], cutoffs[kept]
 
+    result = df.iloc[student].reset_index(names="student")
+    result["category"] = arrays["category_names"][arrays["categories"][pair]]
+    result["course"] = arrays["course_names"][arrays["courses"][pair]]
+    result["min_marks"] = cutoffs
+    result["recommendation"] = pd.Categorical.from_codes(bucket_codes, categories=RESULT_KEYS)
     return result
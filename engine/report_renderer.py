@@ -0,0 +1,90 @@
+#engine/report_renderer.py
+
+from engine.recommendation_engine import rank_courses
+
+# Courses per table in a report; the rest are summarised as a count
+REPORT_TOP_K = 25
+
+def clean(txt):
+    return txt.encode("latin-1", "ignore").decode("latin-1")
+
+def student_profile(name, board, stream, subject_combo, marks):
+    return (
+        ("Student Name", name),
+        ("Board", board),
+        ("Stream", stream),
+        ("Subject Combination", subject_combo),
+        ("Expected Marks", f"{marks}%")
+    )
+
+def _shown_note(pdf, shown, total):
+    if total is not None and total > shown:
+        pdf.set_font("Arial", "I", 10)
+        pdf.cell(0, 8, clean(f"Showing the top {shown} of {total} courses"), ln=True)
+
+def render_report_pdf(profile, best_fit, alternate, best_fit_total=None, alternate_total=None):
+    # Imported on the first report, not when the student page starts
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 12, clean("Career Recommendation Report"), ln=True, align="C")
+    pdf.ln(6)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 10, clean("Student Profile"), ln=True)
+
+    pdf.set_font("Arial", size=11)
+    for label, value in profile:
+        pdf.cell(60, 8, clean(label), border=1)
+        pdf.cell(120, 8, clean(value), border=1, ln=True)
+
+    pdf.ln(6)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 10, clean("Recommended Courses"), ln=True)
+
+    pdf.set_font("Arial", "B", 11)
+    pdf.cell(20, 8, "S.No", border=1)
+    pdf.cell(160, 8, "Course Name", border=1, ln=True)
+
+    pdf.set_font("Arial", size=11)
+    for i, c in enumerate(best_fit, start=1):
+        pdf.cell(20, 8, str(i), border=1)
+        pdf.cell(160, 8, clean(c), border=1, ln=True)
+    _shown_note(pdf, len(best_fit), best_fit_total)
+
+    pdf.ln(6)
+
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 10, clean("Alternate Career Options"), ln=True)
+
+    pdf.set_font("Arial", "B", 11)
+    pdf.cell(20, 8, "S.No", border=1)
+    pdf.cell(160, 8, "Course Name", border=1, ln=True)
+
+    pdf.set_font("Arial", size=11)
+    if alternate:
+        for i, c in enumerate(alternate, start=1):
+            pdf.cell(20, 8, str(i), border=1)
+            pdf.cell(160, 8, clean(c), border=1, ln=True)
+    else:
+        pdf.cell(180, 8, clean("No alternate options available"), border=1, ln=True)
+    _shown_note(pdf, len(alternate), alternate_total)
+
+    # fpdf returns a latin-1 str, fpdf2 a bytearray
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+def render_student_report(name, board, stream, subject_combo, marks):
+    best_fit = rank_courses(subject_combo, marks, ("best_fit",), k=REPORT_TOP_K, board=board)
+    alternate = rank_courses(subject_combo, marks, ("safe_options", "backup_options"), k=REPORT_TOP_K, board=board)
+    return render_report_pdf(
+        student_profile(name, board, stream, subject_combo, marks),
+        best_fit["courses"],
+        alternate["courses"],
+        best_fit["total"],
+        alternate["total"]
+    )
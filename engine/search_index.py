@@ -0,0 +1,210 @@
+#engine/search_index.py
+
+# Autocomplete over course and category names. Names are split into words
+# ("B.Sc Biotechnology" -> "bsc", "biotechnology"); a query matches a name
+# when each query word is a prefix of one of its words, so "biotech" and
+# "bsc bio" both find it. Prefixes are answered from the sorted word list
+# with bisect. Query words with no prefix match fall back to words sharing
+# trigrams with them, kept when within a small edit distance ("biotehc").
+#
+# Entries are added and removed one at a time, so admin edits never
+# rebuild the index. Sorting is deferred to the next search, which makes
+# the first build a plain bulk load.
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+
+# Matching entries ranked per query; enough for autocomplete
+CANDIDATE_LIMIT = 50
+
+# Entries looked at per query before giving up on finding more matches
+SCAN_LIMIT = 2_000
+
+# Words checked with edit distance per misspelt query word
+FUZZY_CANDIDATES = 30
+
+_WORD = re.compile(r"[^\W_]+")
+
+def words(text):
+    # Dots and apostrophes join rather than split: "B.Sc" -> "bsc"
+    return _WORD.findall(text.lower().replace(".", "").replace("'", ""))
+
+def _grams(word):
+    padded = f"${word}"
+    return {padded[i:i + 3] for i in range(max(1, len(padded) - 2))}
+
+def _max_typos(word):
+    if len(word) < 3:
+        return 0
+    return 1 if len(word) < 6 else 2
+
+def prefix_distance(query, word, limit):
+    # Fewest edits (with adjacent swaps) turning query into some prefix of
+    # word, or limit + 1 when it takes more than limit
+    word = word[:len(query) + limit]
+    previous2 = None
+    previous = list(range(len(word) + 1))
+    for i, qc in enumerate(query, 1):
+        current = [i] + [0] * len(word)
+        for j, wc in enumerate(word, 1):
+            cost = 0 if qc == wc else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and qc == word[j - 2] and query[i - 2] == wc:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[max(0, len(query) - limit):])
+
+def _typo_edits(folded, typos):
+    # Edits needed for the misspelt query words, or None if one has no match
+    edits = 0
+    for distances in typos.values():
+        found = [d for word, d in distances.items() if f" {word} " in folded + " "]
+        if not found:
+            return None
+        edits += found[0]
+    return edits
+
+class SearchIndex:
+    # Entries are kept as (len(name), name, kind) so that posting lists
+    # sort shortest name first, which is also the order results rank in
+    def __init__(self):
+        self._entries = {}        # entry -> " word word ..." for word-start checks
+        self._postings = {}       # word -> [entry], sorted
+        self._vocab = []          # every word, sorted
+        self._grams = None        # trigram -> {word}, built on the first typo
+        self._unsorted = set()    # words whose postings need sorting
+        self._vocab_stale = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        kind, name = item
+        return (len(name), name, kind) in self._entries
+
+    def add(self, kind, name):
+        entry = (len(name), name, kind)
+        if entry in self._entries:
+            return
+        entry_words = list(dict.fromkeys(words(name)))
+        self._entries[entry] = " " + " ".join(entry_words)
+        for word in entry_words:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = []
+                self._vocab_stale = True
+                if self._grams is not None:
+                    for gram in _grams(word):
+                        self._grams.setdefault(gram, set()).add(word)
+            postings.append(entry)
+            self._unsorted.add(word)
+
+    def remove(self, kind, name):
+        entry = (len(name), name, kind)
+        folded = self._entries.pop(entry, None)
+        if folded is None:
+            return
+        for word in folded.split():
+            postings = self._postings[word]
+            postings.remove(entry)
+            if postings:
+                continue
+            del self._postings[word]
+            self._unsorted.discard(word)
+            self._vocab_stale = True
+            if self._grams is not None:
+                for gram in _grams(word):
+                    gram_words = self._grams[gram]
+                    gram_words.discard(word)
+                    if not gram_words:
+                        del self._grams[gram]
+
+    def _settle(self):
+        if self._vocab_stale:
+            self._vocab = sorted(self._postings)
+            self._vocab_stale = False
+        for word in self._unsorted:
+            self._postings[word].sort()
+        self._unsorted.clear()
+
+    def _prefix_words(self, prefix):
+        # Words starting with prefix, and roughly how many entries they hold:
+        # exact for the first words, one per word after that
+        lo = bisect_left(self._vocab, prefix)
+        hi = bisect_left(self._vocab, prefix + "\U0010ffff", lo)
+        matched = self._vocab[lo:hi]
+        count = sum(len(self._postings[w]) for w in matched[:64]) + max(0, len(matched) - 64)
+        return matched, count
+
+    def _fuzzy_words(self, word):
+        # Words sharing the most trigrams, kept when few enough edits away
+        limit = _max_typos(word)
+        if not limit:
+            return {}
+        if self._grams is None:
+            self._grams = {}
+            for known in self._postings:
+                for gram in _grams(known):
+                    self._grams.setdefault(gram, set()).add(known)
+
+        shared = Counter()
+        for gram in _grams(word):
+            shared.update(self._grams.get(gram, ()))
+
+        matches = {}
+        for candidate, _ in shared.most_common(FUZZY_CANDIDATES):
+            distance = prefix_distance(word, candidate, limit)
+            if distance <= limit:
+                matches[candidate] = distance
+        return dict(sorted(matches.items(), key=lambda item: item[1]))
+
+    def search(self, query, limit=10):
+        # [(kind, name)] best first: fewest typos, then names starting with
+        # the query, then shortest name
+        query_words = words(query)
+        if not query_words:
+            return []
+        self._settle()
+
+        # Each query word matches some index words. The one whose words hold
+        # the fewest entries supplies the candidates; the rest are checked
+        # against each candidate's words.
+        typos = {}
+        driver, fewest = None, None
+        for word in query_words:
+            matched, count = self._prefix_words(word)
+            if not matched:
+                typos[word] = self._fuzzy_words(word)
+                matched = list(typos[word])
+                count = sum(len(self._postings[w]) for w in matched)
+                if not matched:
+                    return []
+            if fewest is None or count < fewest:
+                driver, fewest = matched, count
+
+        # Shorter words first, so "12" reaches "Course 121" before "Course 1200"
+        driver = sorted(driver[:SCAN_LIMIT], key=len)
+
+        lead = " " + " ".join(query_words)
+        required = [" " + word for word in query_words if word not in typos]
+        ranked = {}
+        postings = (entry for word in driver for entry in self._postings[word])
+        for entry in islice(postings, SCAN_LIMIT):
+            if entry in ranked:
+                continue
+            folded = self._entries[entry]
+            for needle in required:
+                if needle not in folded:
+                    break
+            else:
+                edits = _typo_edits(folded, typos) if typos else 0
+                if edits is not None:
+                    ranked[entry] = (edits, not folded.startswith(lead), entry)
+                    if len(ranked) >= CANDIDATE_LIMIT:
+                        break
+
+        return [(kind, name) for _, _, (_, name, kind) in sorted(ranked.values())[:limit]]
@@ -1,10 +1,49 @@
 #pages/1_Master_Admin.py
+import os
+import time
 import streamlit as st
 import pandas as pd
-from utils.data_loader import load_json, save_json
+from utils.data_loader import (
+    load_catalog,
+    commit_changes,
+    rollback_catalog,
+    catalog_history,
+    catalog_version,
+    get_store,
+    tenant_status,
+    use_tenant
+)
+from utils import catalog_io, profiler
+from utils.journal import set_entry, delete_entry
+from utils.metrics import observe_since, prometheus_text, snapshot, timed
+from engine import cutoff_whatif
+from engine.eligibility_rules import with_min_marks
+from engine.recommendation_engine import (
+    course_impact,
+    course_rule,
+    category_impact,
+    orphans_after_combo_delete,
+    integrity_report,
+    search_catalog
+)
+
+rerun_started = time.perf_counter()
 
 st.set_page_config(page_title="Master Admin Dashboard", layout="wide")
 
+# ==================================================
+# TENANT
+# ==================================================
+# Same as the student app: ?tenant=<name>, else the session's, else the
+# default catalog
+tenant_name = st.query_params.get("tenant") or st.session_state.get("tenant")
+try:
+    use_tenant(tenant_name)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+st.session_state.tenant = tenant_name
+
 # ==================================================
 # STYLES
 # ==================================================
@@ -106,15 +145,73 @@ if not st.session_state.admin:
 # ==================================================
 # LOAD DATA
 # ==================================================
-boards = load_json("boards.json")
-streams = load_json("streams.json")
-categories = load_json("course_categories.json")
-courses = load_json("courses.json")
-eligibility = load_json("eligibility_rules.json")
+# Shared with the student app; treat as read-only and commit edited entries
+if tenant_name:
+    st.caption(f"Catalog of {tenant_name}")
+with timed("admin.catalog_load"):
+    catalog = load_catalog()
+boards = catalog["boards.json"]
+streams = catalog["streams.json"]
+categories = catalog["course_categories.json"]
+courses = catalog["courses.json"]
+eligibility = catalog["eligibility_rules.json"]
+
+# Changes listed before an import is applied; the rest are only counted
+IMPORT_PREVIEW_ROWS = 1000
+
+# Edits listed per change in the history table
+HISTORY_EDITS_SHOWN = 5
+
+# Issues listed on the Dashboard; the rest are only counted
+INTEGRITY_ROWS = 500
+
+WHATIF_BUCKETS = {"best_fit": "Best fit", "safe_options": "Safe", "backup_options": "Backup"}
+
+PROFILE_TARGETS = {"app": "Student page reruns", "engine": "Engine calls"}
+PROFILE_MODES = {"cprofile": "cProfile (every call)", "sampling": "Sampling"}
+PROFILE_FILES = {"folded": "Download Collapsed Stacks", "pstats": "Download pstats"}
+
+def without(items, value):
+    items = list(items)
+    items.remove(value)
+    return items
+
+def show_impact(impact):
+    # Blast radius of an edit, from the engine's reverse indexes
+    st.caption(
+        f"Reaches {len(impact['subject_combos'])} subject combination(s) "
+        f"across {len(impact['streams'])} stream(s) and {len(impact['boards'])} board(s)"
+    )
+    if impact["subject_combos"]:
+        st.caption("Affected combinations: " + ", ".join(impact["subject_combos"]))
+
+def read_file(path):
+    # For download buttons, read only when clicked
+    with open(path, "rb") as f:
+        return f.read()
+
+def jump_to(hit):
+    # Runs before the next rerun draws the widgets it points at
+    st.session_state.admin_section = "🎓 Courses"
+    st.session_state.course_category = hit["categories"][0]
 
 # ==================================================
 # SIDEBAR
 # ==================================================
+query = st.sidebar.text_input("🔎 Find course or category", placeholder="cyber, biotech, ...")
+if query:
+    hits = [hit for hit in search_catalog(query, limit=8) if hit["categories"]]
+    for hit in hits:
+        st.sidebar.button(
+            f"{'🎓' if hit['kind'] == 'course' else '🧩'} {hit['name']}",
+            key=f"jump-{hit['kind']}-{hit['name']}",
+            on_click=jump_to,
+            args=(hit,),
+            width="stretch"
+        )
+    if not hits:
+        st.sidebar.caption("No matches")
+
 section = st.sidebar.radio(
     "Admin Sections",
     [
@@ -122,10 +219,18 @@ section = st.sidebar.radio(
         "📘 Streams & Subjects",
         "🧩 Course Categories",
         "🎓 Courses",
-        "📏 Eligibility Rules"
-    ]
+        "📏 Eligibility Rules",
+        "📥 Bulk Import / Export",
+        "🕘 Change History"
+    ],
+    key="admin_section"
 )
 
+# Re-checked after every save for just the entries the edit touched
+issue_count = sum(integrity_report(limit=0)["counts"].values())
+if issue_count:
+    st.sidebar.warning(f"⚠ {issue_count:,} catalog integrity issue(s); see the Dashboard")
+
 # ==================================================
 # 📊 DASHBOARD
 # ==================================================
@@ -144,6 +249,130 @@ if section == "📊 Dashboard":
 
     st.markdown("</div>", unsafe_allow_html=True)
 
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>Performance</div>", unsafe_allow_html=True)
+    st.markdown("<div class='desc'>Latency per phase in this server process since it started.</div>", unsafe_allow_html=True)
+
+    metrics = snapshot()
+    if not metrics["phases"]:
+        st.info("No timings recorded yet")
+    else:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Phase": phase,
+                    "Count": m["count"],
+                    "Mean (ms)": round(m["mean_ms"], 2),
+                    "p50 (ms)": m["p50_ms"],
+                    "p95 (ms)": m["p95_ms"],
+                    "p99 (ms)": m["p99_ms"]
+                }
+                for phase, m in metrics["phases"].items()
+            ]),
+            hide_index=True,
+            width="stretch"
+        )
+        st.caption("Percentiles are bucket upper bounds.")
+
+    if metrics["counters"]:
+        st.caption(" · ".join(f"{name}: {n:,}" for name, n in metrics["counters"].items()))
+
+    tenants = tenant_status()
+    if tenants["tenants"] or tenants["available"]:
+        st.caption(
+            f"Tenants loaded: {len(tenants['tenants'])} of {len(tenants['available'])} · "
+            f"{tenants['bytes'] / 2**20:,.1f} of {tenants['budget'] / 2**20:,.0f} MB of catalog files"
+        )
+
+    st.download_button(
+        "Download Prometheus Metrics",
+        data=prometheus_text(),
+        file_name="career_guidance_metrics.txt",
+        mime="text/plain"
+    )
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>Profiler</div>", unsafe_allow_html=True)
+    st.markdown("<div class='desc'>Where the time goes in the next few student page reruns or engine calls in this server process. Sampling suits slow reruns; cProfile also catches short engine calls.</div>", unsafe_allow_html=True)
+
+    armed = profiler.status()
+    if armed:
+        st.info(
+            f"Capturing a {PROFILE_MODES[armed['mode']]} profile of "
+            f"{PROFILE_TARGETS[armed['target']].lower()}: {armed['done']} of {armed['runs']} done"
+        )
+        if st.button("Stop Profiling"):
+            profiler.disarm()
+            st.rerun()
+    else:
+        c1, c2, c3 = st.columns(3)
+        profile_target = c1.selectbox("Profile", list(PROFILE_TARGETS), format_func=PROFILE_TARGETS.get)
+        profile_mode = c2.selectbox("Mode", list(PROFILE_MODES), format_func=PROFILE_MODES.get)
+        profile_runs = c3.number_input("Runs", 1, 100, value=5)
+        if st.button("Arm Profiler"):
+            profiler.arm(profile_target, int(profile_runs), profile_mode)
+            st.rerun()
+
+    captures = {capture["name"]: capture for capture in profiler.list_captures()}
+    if not captures:
+        st.caption("No profiles captured yet")
+    else:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Captured": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(capture["created"])),
+                    "Profile": PROFILE_TARGETS.get(capture["target"], capture["target"]),
+                    "Mode": PROFILE_MODES.get(capture["mode"], capture["mode"]),
+                    "Runs": capture["runs"],
+                    "Time (s)": round(capture["seconds"], 3)
+                }
+                for capture in captures.values()
+            ]),
+            hide_index=True,
+            width="stretch"
+        )
+        chosen = captures[st.selectbox("Capture", list(captures))]
+        for column, (kind, path) in zip(st.columns(len(PROFILE_FILES)), chosen["files"].items()):
+            column.download_button(
+                PROFILE_FILES.get(kind, kind),
+                data=lambda path=path: read_file(path),
+                file_name=os.path.basename(path),
+                mime="application/octet-stream" if kind == "pstats" else "text/plain",
+                key=f"profile-{kind}"
+            )
+        st.caption("Collapsed stacks open in speedscope or flamegraph.pl; pstats in python -m pstats or snakeviz.")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>Catalog Integrity</div>", unsafe_allow_html=True)
+    st.markdown("<div class='desc'>Gaps students would not see as errors: missing cutoffs, entries nothing links to, duplicates and links to missing entries.</div>", unsafe_allow_html=True)
+
+    report = integrity_report(limit=INTEGRITY_ROWS)
+    if not report["counts"]:
+        st.success("No integrity issues found")
+    else:
+        st.caption(" · ".join(f"{check.replace('_', ' ')}: {n:,}" for check, n in report["counts"].items()))
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Check": issue["check"].replace("_", " "),
+                    "Level": issue["level"],
+                    "Name": issue["name"],
+                    "Detail": issue["detail"]
+                }
+                for issue in report["issues"]
+            ]),
+            hide_index=True,
+            width="stretch"
+        )
+        if issue_count > INTEGRITY_ROWS:
+            st.caption(f"Showing the first {INTEGRITY_ROWS:,} of {issue_count:,} issues")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
 # ==================================================
 # 📘 STREAMS & SUBJECTS
 # ==================================================
@@ -165,8 +394,7 @@ elif section == "📘 Streams & Subjects":
 
     if st.button("Add Subject Combination"):
         if new_subject and new_subject not in streams[stream]:
-            streams[stream].append(new_subject)
-            save_json("streams.json", streams)
+            commit_changes([set_entry("streams.json", stream, streams[stream] + [new_subject])])
             st.success("Subject combination added")
             st.rerun()
 
@@ -176,13 +404,22 @@ elif section == "📘 Streams & Subjects":
     st.caption("⚠ This removes linked categories & courses")
 
     del_subject = st.selectbox("Select Subject", streams[stream])
+
+    orphans = orphans_after_combo_delete(del_subject, stream) if del_subject else {"categories": [], "courses": []}
+    if orphans["categories"]:
+        st.caption("Categories removed: " + ", ".join(orphans["categories"]))
+    if orphans["courses"]:
+        st.caption("Courses removed: " + ", ".join(orphans["courses"]))
+
     confirm = st.checkbox("I understand the impact")
 
     if st.button("Delete Subject") and confirm:
-        streams[stream].remove(del_subject)
-        categories.pop(del_subject, None)
-        save_json("streams.json", streams)
-        save_json("course_categories.json", categories)
+        ops = [set_entry("streams.json", stream, without(streams[stream], del_subject))]
+        if not any(del_subject in combos for s, combos in streams.items() if s != stream):
+            ops.append(delete_entry("course_categories.json", del_subject))
+        ops += [delete_entry("courses.json", c) for c in orphans["categories"]]
+        ops += [delete_entry("eligibility_rules.json", c) for c in orphans["courses"]]
+        commit_changes(ops)
         st.warning("Subject deleted")
         st.rerun()
 
@@ -202,19 +439,19 @@ elif section == "🧩 Course Categories":
     new_category = st.text_input("New Category", placeholder="Data & IT")
 
     if st.button("Add Category"):
-        categories.setdefault(subject, []).append(new_category)
-        save_json("course_categories.json", categories)
+        commit_changes([set_entry("course_categories.json", subject, categories.get(subject, []) + [new_category])])
         st.success("Category added")
         st.rerun()
 
     st.divider()
 
     del_category = st.selectbox("Delete Category", categories.get(subject, []))
+    if del_category:
+        show_impact(category_impact(del_category))
     confirm = st.checkbox("Confirm deletion")
 
     if st.button("Delete Category") and confirm:
-        categories[subject].remove(del_category)
-        save_json("course_categories.json", categories)
+        commit_changes([set_entry("course_categories.json", subject, without(categories[subject], del_category))])
         st.warning("Category deleted")
         st.rerun()
 
@@ -228,27 +465,29 @@ elif section == "🎓 Courses":
     st.markdown("<div class='section-title'>Courses</div>", unsafe_allow_html=True)
     st.markdown("<div class='desc'>Exact degrees and programs recommended to students.</div>", unsafe_allow_html=True)
 
-    category = st.selectbox("Category", list(courses.keys()))
+    category = st.selectbox("Category", list(courses.keys()), key="course_category")
     st.table(pd.DataFrame({"Course": courses[category]}))
 
     new_course = st.text_input("New Course", placeholder="B.Tech (AI & ML)")
 
     if st.button("Add Course"):
-        courses.setdefault(category, []).append(new_course)
-        save_json("courses.json", courses)
+        commit_changes([set_entry("courses.json", category, courses.get(category, []) + [new_course])])
         st.success("Course added")
         st.rerun()
 
     st.divider()
 
     del_course = st.selectbox("Delete Course", courses[category])
+    if del_course:
+        show_impact(course_impact(del_course))
     confirm = st.checkbox("Remove eligibility rules also")
 
     if st.button("Delete Course") and confirm:
-        courses[category].remove(del_course)
-        eligibility.pop(del_course, None)
-        save_json("courses.json", courses)
-        save_json("eligibility_rules.json", eligibility)
+        ops = [set_entry("courses.json", category, without(courses[category], del_course))]
+        # The rule stays while another category still lists the course
+        if set(course_impact(del_course)["categories"]) <= {category}:
+            ops.append(delete_entry("eligibility_rules.json", del_course))
+        commit_changes(ops)
         st.warning("Course deleted")
         st.rerun()
 
@@ -263,13 +502,228 @@ elif section == "📏 Eligibility Rules":
     st.markdown("<div class='desc'>Controls minimum score required for course recommendation.</div>", unsafe_allow_html=True)
 
     course = st.selectbox("Course", list(eligibility.keys()))
-    marks = st.number_input("Minimum Percentage", 40, 100, value=eligibility.get(course, 50))
+    rule = eligibility.get(course, 50)
+    # Any cutoff a rule can hold, as a bulk import may set: 0-100, decimals
+    # included. An invalid rule starts from the default it is served with.
+    current = course_rule(course).min_marks
+    marks = st.number_input("Minimum Percentage", 0.0, 100.0, value=float(current), step=1.0, format="%g")
+    marks = int(marks) if marks.is_integer() else marks
+    # Board cutoffs, band, reservations and required subjects are edited in
+    # eligibility_rules.json; saving here keeps them
+    extras = {field: value for field, value in rule.items() if field != "min_marks"} if isinstance(rule, dict) else {}
+    if extras:
+        st.caption("The rest of this rule, kept when saving:")
+        st.json(extras, expanded=False)
+    show_impact(course_impact(course))
 
     if st.button("Save Eligibility"):
-        eligibility[course] = marks
-        save_json("eligibility_rules.json", eligibility)
+        commit_changes([set_entry("eligibility_rules.json", course, with_min_marks(rule, marks))])
         st.success("Eligibility updated")
         st.rerun()
 
+    st.divider()
+
+    st.subheader("🔮 What-if")
+    st.caption("How a past cohort would move between buckets at the percentage above, before saving it. CSV with subject_combo and marks columns; other columns are ignored.")
+    cohort_file = st.file_uploader("Past cohort", type=["csv"], key="whatif_upload")
+
+    if cohort_file is not None:
+        # Loaded once per file; each cutoff tried after that is a few lookups
+        if st.session_state.get("whatif_cohort", (None,))[0] != cohort_file.file_id:
+            try:
+                with timed("admin.whatif_load"):
+                    cohort = cutoff_whatif.read_cohort(cohort_file)
+            except ValueError as e:
+                cohort = str(e)
+            st.session_state.whatif_cohort = (cohort_file.file_id, cohort)
+        cohort = st.session_state.whatif_cohort[1]
+
+        if isinstance(cohort, str):
+            st.error(cohort)
+        else:
+            with timed("admin.whatif"):
+                moves = cohort.moves(
+                    {course: (current, marks)},
+                    lambda c: course_impact(c)["subject_combos"],
+                    lambda c: course_rule(c).band
+                )
+            skipped = f"; {cohort.skipped:,} row(s) without a subject combination or valid marks skipped" if cohort.skipped else ""
+            st.caption(f"{len(cohort):,} students loaded{skipped}.")
+
+            if moves.empty:
+                st.info("No student in this cohort took a subject combination offering this course")
+            else:
+                move_columns = [c for c in moves.columns if " -> " in c]
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Students offered the course", f"{moves['students'].sum():,}")
+                c2.metric("Change bucket", f"{moves[move_columns].to_numpy().sum():,}")
+                c3.metric("Subject combinations", f"{len(moves):,}")
+
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "Bucket": label,
+                            f"At {current:g}%": moves[f"{bucket} before"].sum(),
+                            f"At {marks:g}%": moves[f"{bucket} after"].sum()
+                        }
+                        for bucket, label in WHATIF_BUCKETS.items()
+                    ]),
+                    hide_index=True,
+                    width="stretch"
+                )
+
+                moved = moves[moves[move_columns].sum(axis=1) > 0]
+                if not moved.empty:
+                    st.dataframe(
+                        moved[["subject_combo", "students"] + move_columns].rename(columns={
+                            "subject_combo": "Subject Combination",
+                            "students": "Students",
+                            **{
+                                c: " → ".join(WHATIF_BUCKETS[b] for b in c.split(" -> "))
+                                for c in move_columns
+                            }
+                        }),
+                        hide_index=True,
+                        width="stretch"
+                    )
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# ==================================================
+# 📥 BULK IMPORT / EXPORT
+# ==================================================
+elif section == "📥 Bulk Import / Export":
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>Bulk Import / Export</div>", unsafe_allow_html=True)
+    st.markdown("<div class='desc'>Load a whole catalog from one table. New boards, streams, combinations, categories, courses and cutoffs are merged in as a single change; nothing is deleted.</div>", unsafe_allow_html=True)
+
+    st.caption("Columns: " + ", ".join(catalog_io.COLUMNS) + ". Leading or trailing columns may be left blank.")
+
+    formats = ["csv", "xlsx"] if catalog_io.excel_supported() else ["csv"]
+    upload = st.file_uploader("Catalog file", type=formats)
+    if not catalog_io.excel_supported():
+        st.caption("Excel files need openpyxl installed on the server; CSV always works.")
+
+    if upload is not None:
+        # Planned once per file and catalog version, not on every rerun
+        plan_key = (upload.file_id, catalog_version())
+        if st.session_state.get("import_plan", (None,))[0] != plan_key:
+            try:
+                with timed("admin.import_plan"):
+                    plan = catalog_io.plan_import(catalog, catalog_io.read_rows(upload, upload.name))
+            except ValueError as e:
+                plan = {"failed": str(e)}
+            st.session_state.import_plan = (plan_key, plan)
+        plan = st.session_state.import_plan[1]
+
+        if "failed" in plan:
+            st.error(plan["failed"])
+        elif plan["error_count"]:
+            st.error(f"{plan['error_count']:,} of {plan['rows']:,} rows have problems; fix them and upload again")
+            st.dataframe(pd.DataFrame(plan["errors"]), hide_index=True, width="stretch")
+        else:
+            added = plan["added"]
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Rows", f"{plan['rows']:,}")
+            c2.metric("New entries", f"{sum(k not in catalog[f] for f, keys in added.items() for k in keys):,}")
+            c3.metric("New links", f"{sum(len(v) for keys in added.values() for v in keys.values()):,}")
+            c4.metric("Cutoff changes", f"{len(plan['cutoffs']):,}")
+
+            diff = [
+                {
+                    "File": filename,
+                    "Entry": key,
+                    "Status": "new" if key not in catalog[filename] else "updated",
+                    "Adds": ", ".join(children)
+                }
+                for filename, keys in added.items()
+                for key, children in keys.items()
+            ]
+            diff += [
+                {
+                    "File": "eligibility_rules.json",
+                    "Entry": course,
+                    "Status": "new" if old is None else "updated",
+                    "Adds": f"{old} → {new}" if old is not None else str(new)
+                }
+                for course, (old, new) in plan["cutoffs"].items()
+            ]
+
+            if not diff:
+                st.info("Everything in this file is already in the catalog")
+            else:
+                st.dataframe(pd.DataFrame(diff[:IMPORT_PREVIEW_ROWS]), hide_index=True, width="stretch")
+                if len(diff) > IMPORT_PREVIEW_ROWS:
+                    st.caption(f"Showing the first {IMPORT_PREVIEW_ROWS:,} of {len(diff):,} changes")
+
+                if st.button("Apply Import"):
+                    with timed("admin.import_commit"):
+                        commit_changes(plan["ops"])
+                    st.success(f"Imported {len(diff):,} changes as one edit")
+                    st.rerun()
+
+    st.divider()
+
+    st.subheader("📤 Export")
+    st.caption("The current catalog in the same format, ready to edit and import again.")
+    # Built on another thread when clicked, so from this session's store
+    store = get_store()
+    c1, c2 = st.columns(2)
+    c1.download_button(
+        "Download CSV",
+        data=lambda: catalog_io.export_csv(store.load()),
+        file_name="career_catalog.csv",
+        mime="text/csv"
+    )
+    if catalog_io.excel_supported():
+        c2.download_button(
+            "Download Excel",
+            data=lambda: catalog_io.export_xlsx(store.load()),
+            file_name="career_catalog.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# ==================================================
+# 🕘 CHANGE HISTORY
+# ==================================================
+elif section == "🕘 Change History":
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>Change History</div>", unsafe_allow_html=True)
+    st.markdown("<div class='desc'>Every admin edit is journaled. Roll back to any earlier point; the rollback itself is recorded and can be undone.</div>", unsafe_allow_html=True)
+
+    history = catalog_history()[::-1]
+
+    if not history:
+        st.info("No edits recorded yet")
+    else:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Change": r["seq"],
+                    "Time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["ts"])),
+                    "Edits": ", ".join(f"{op['file']} → {op['key']}" for op in r["ops"][:HISTORY_EDITS_SHOWN])
+                    + (f" and {len(r['ops']) - HISTORY_EDITS_SHOWN:,} more" if len(r["ops"]) > HISTORY_EDITS_SHOWN else "")
+                }
+                for r in history
+            ]),
+            hide_index=True,
+            width="stretch"
+        )
+
+        target = st.selectbox(
+            "Restore catalog as it was after change",
+            [r["seq"] for r in history] + [0],
+            format_func=lambda seq: "Before any recorded change" if seq == 0 else f"Change {seq}"
+        )
+        confirm = st.checkbox("I understand later edits will be undone")
+
+        if st.button("Roll Back") and confirm:
+            rollback_catalog(target)
+            st.warning("Catalog rolled back")
+            st.rerun()
+
     st.markdown("</div>", unsafe_allow_html=True)
 
+observe_since("admin.rerun", rerun_started)
@@ -0,0 +1,148 @@
+#scripts/bulk_reports.py
+#
+# One PDF report per student, for a whole cohort, into a single ZIP:
+#   python -m scripts.bulk_reports students.csv reports.zip --workers 8
+#
+# The input needs name, board, stream, subject_combo and marks columns.
+# Reports are rendered across a process pool and written into the archive
+# as they complete, with a bounded number of batches in flight. Rows that
+# cannot be reported (blank or invalid marks, a board/stream/subject_combo
+# path not in the catalog) are skipped and listed in <output>_errors.csv.
+
+import argparse
+import csv
+import math
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from engine.recommendation_engine import get_streams_by_board, get_subject_combinations
+from engine.report_renderer import render_student_report
+
+REQUIRED_COLUMNS = ["name", "board", "stream", "subject_combo", "marks"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render a career report PDF for every student in a CSV.")
+    parser.add_argument("input", help="Student CSV (name, board, stream, subject_combo, marks)")
+    parser.add_argument("output", help="ZIP archive to write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Renderer processes")
+    parser.add_argument("--batch", type=int, default=50, help="Students sent to a worker at a time")
+    return parser.parse_args(argv)
+
+def report_name(row_number, name):
+    # Row number keeps students with the same name apart
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "student"
+    return f"{row_number:06d}_{safe}_Career_Recommendation_Report.pdf"
+
+def errors_path(output):
+    return f"{os.path.splitext(output)[0]}_errors.csv"
+
+def parse_marks(value):
+    try:
+        marks = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"marks must be a number, got {value!r}") from None
+    if not math.isfinite(marks) or not 0 <= marks <= 100:
+        raise ValueError(f"marks must be between 0 and 100, got {value!r}")
+    return int(marks) if marks.is_integer() else marks
+
+def check_row(row):
+    # The row's marks, or ValueError saying why it gets no report
+    blank = [c for c in REQUIRED_COLUMNS if not (row[c] or "").strip()]
+    if blank:
+        raise ValueError(f"missing {', '.join(blank)}")
+    marks = parse_marks(row["marks"])
+    if row["stream"] not in get_streams_by_board(row["board"]) \
+            or row["subject_combo"] not in get_subject_combinations(row["stream"]):
+        raise ValueError(f"unknown path {row['board']} / {row['stream']} / {row['subject_combo']}")
+    return marks
+
+def render_batch(batch):
+    # (row number, name, report name, PDF) per student; a student whose
+    # report fails gets the error in place of the PDF, not the whole batch
+    rendered = []
+    for row_number, row, marks in batch:
+        try:
+            pdf_bytes = render_student_report(row["name"], row["board"], row["stream"], row["subject_combo"], marks)
+        except Exception as e:
+            rendered.append((row_number, row["name"], None, f"report failed: {e}"))
+        else:
+            rendered.append((row_number, row["name"], report_name(row_number, row["name"]), pdf_bytes))
+    return rendered
+
+def checked_rows(rows, errors):
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            marks = check_row(row)
+        except ValueError as e:
+            errors.append((row_number, row["name"], str(e)))
+        else:
+            yield row_number, row, marks
+
+def batches(numbered, size):
+    while True:
+        batch = list(islice(numbered, size))
+        if not batch:
+            return
+        yield batch
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            sys.exit(f"Missing columns in {args.input}: {', '.join(missing)}")
+
+        started = time.perf_counter()
+        done = 0
+        pending = set()
+        errors = []
+        todo = batches(checked_rows(reader, errors), args.batch)
+
+        with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+                zipfile.ZipFile(args.output, "w", zipfile.ZIP_DEFLATED) as archive:
+
+            while True:
+                while len(pending) < args.workers * 2:
+                    batch = next(todo, None)
+                    if batch is None:
+                        break
+                    pending.add(pool.submit(render_batch, batch))
+
+                if not pending:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for row_number, name, arcname, report in future.result():
+                        if arcname is None:
+                            errors.append((row_number, name, report))
+                            continue
+                        archive.writestr(arcname, report)
+                        done += 1
+
+                elapsed = time.perf_counter() - started
+                print(f"{done:,} reports, {done / elapsed:,.1f} reports/sec", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {done:,} reports to {args.output} in {elapsed:.1f}s", file=sys.stderr)
+
+    if errors:
+        errors.sort()
+        with open(errors_path(args.output), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "name", "problem"])
+            writer.writerows(errors)
+        print(f"Skipped {len(errors):,} rows, listed in {errors_path(args.output)}", file=sys.stderr)
+    elif os.path.exists(errors_path(args.output)):
+        # Left by an earlier run into the same archive
+        os.remove(errors_path(args.output))
+
+if __name__ == "__main__":
+    main()
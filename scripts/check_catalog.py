@@ -0,0 +1,41 @@
+#scripts/check_catalog.py
+#
+# Reports catalog integrity issues (see engine/integrity.py), e.g. as a
+# deploy gate after a bulk import:
+#   python -m scripts.check_catalog
+#   python -m scripts.check_catalog --data-dir /srv/catalog --ignore missing_cutoff
+#
+# Exits non-zero when any issue outside --ignore is found.
+
+import argparse
+import sys
+
+from engine.integrity import CHECKS
+from engine.recommendation_engine import integrity_report
+from utils.data_loader import use_data_dir
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the catalog for integrity issues.")
+    parser.add_argument("--data-dir", help="Catalog directory (default: data/)")
+    parser.add_argument("--limit", type=int, default=50, help="Issues to list")
+    parser.add_argument("--ignore", nargs="*", default=[], choices=CHECKS, help="Checks that do not fail the run")
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        use_data_dir(args.data_dir)
+
+    report = integrity_report(limit=None)
+    issues = [issue for issue in report["issues"] if issue["check"] not in args.ignore]
+    for check, n in report["counts"].items():
+        print(f"{check:<16}{n:>8,}{'  (ignored)' if check in args.ignore else ''}")
+    for issue in issues[:args.limit]:
+        print(f"  {issue['check']:<16}{issue['level']:<15}{issue['name']}: {issue['detail']}")
+    if len(issues) > args.limit:
+        print(f"  ... and {len(issues) - args.limit:,} more")
+
+    if issues:
+        sys.exit(f"{len(issues):,} integrity issue(s)")
+    print("No integrity issues")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#scripts/compile_catalog.py
+#
+# Builds the compiled catalog (data/catalog.bin) ahead of time, e.g. in a
+# deploy step before API workers start:
+#   python -m scripts.compile_catalog
+#   python -m scripts.compile_catalog --data-dir /srv/catalog
+#
+# Stores recompile it on their own whenever the JSON files change; this
+# only saves the first process from paying for it.
+#
+# With CAREER_SHARED_CATALOG=1 workers serve the catalog straight from
+# this file, so it is the copy every worker on the host reads.
+
+import argparse
+import os
+import sys
+
+from utils.data_loader import get_store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the JSON catalog into its binary form.")
+    parser.add_argument("--data-dir", help="Catalog directory (default: data/)")
+    args = parser.parse_args(argv)
+
+    path = get_store(args.data_dir).compile()
+    if path is None:
+        sys.exit("Catalog has values the compiled format cannot hold; stores will keep reading JSON")
+    print(f"Wrote {os.path.normpath(path)} ({os.path.getsize(path):,} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#scripts/load_test_api.py
+#
+# Load generator for service/api_server.py, stdlib only:
+#   python -m service.api_server --port 8080 &
+#   python -m scripts.load_test_api --port 8080 --connections 200 --requests 50
+#
+# Each connection is kept alive and sends its requests back to back.
+# Pass --batch N to POST N students per request instead of single GETs.
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from urllib.parse import urlencode
+
+from engine.recommendation_engine import get_boards, get_streams_by_board, get_subject_combinations
+
+def student_profiles():
+    return [
+        subject_combo
+        for board in get_boards()
+        for stream in get_streams_by_board(board)
+        for subject_combo in get_subject_combinations(stream)
+    ]
+
+def build_request(host, combos, batch):
+    if batch:
+        body = json.dumps([
+            {"subject_combo": random.choice(combos), "marks": random.randrange(40, 101)}
+            for _ in range(batch)
+        ]).encode("utf-8")
+        head = f"POST /recommend HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        return head.encode("latin-1") + body
+
+    query = urlencode({"subject_combo": random.choice(combos), "marks": random.randrange(40, 101)})
+    return f"GET /recommend?{query} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def run_connection(args, combos, latencies, errors):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        for _ in range(args.requests):
+            request = build_request(args.host, combos, args.batch)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run(args):
+    combos = student_profiles()
+    latencies, errors = [], []
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_connection(args, combos, latencies, errors)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    students = len(latencies) * (args.batch or 1)
+    print(f"{len(latencies):,} requests over {args.connections} connections in {elapsed:.2f}s")
+    print(f"{len(latencies) / elapsed:,.0f} requests/sec, {students / elapsed:,.0f} students/sec, {len(errors)} errors")
+    print(f"latency ms: p50 {pct(0.50):.2f}  p95 {pct(0.95):.2f}  p99 {pct(0.99):.2f}  mean {statistics.fmean(latencies) * 1000:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the recommendation HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per connection")
+    parser.add_argument("--batch", type=int, default=0, help="Students per POST; 0 sends single GETs")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#scripts/measure_startup.py
+#
+# Cold start of a fresh worker: interpreter plus Streamlit, then the first
+# run of a page, each measured in a new process:
+#   python -m scripts.measure_startup
+#   python -m scripts.measure_startup pages/Master_Admin.py --runs 5 --budget-ms 800
+#
+# Prints the medians and the page's slowest imports (python -X importtime,
+# cumulative). Exits non-zero when the first run's median is over --budget-ms.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# Runs in the child; markers split Streamlit's own imports from the page's
+PROBE = """
+import sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+print("@@ready", time.perf_counter() - started, file=sys.stderr, flush=True)
+started = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+print("@@first_run", time.perf_counter() - started, file=sys.stderr, flush=True)
+if at.exception:
+    sys.exit(f"{sys.argv[1]} raised: {at.exception[0].message}")
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure page cold start in fresh processes.")
+    parser.add_argument("page", nargs="?", default="app.py", help="Streamlit script, relative to the repo root")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes to take the median over")
+    parser.add_argument("--top", type=int, default=15, help="Slowest page imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the first run's median exceeds this")
+    return parser.parse_args(argv)
+
+def measure(page):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, page],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode:
+        sys.exit(proc.stderr.strip().splitlines()[-1])
+
+    timings, imports, in_page = {}, [], False
+    for line in proc.stderr.splitlines():
+        if line.startswith("@@"):
+            marker, seconds = line[2:].split()
+            timings[marker] = float(seconds) * 1000
+            in_page = marker == "ready"
+        elif in_page and line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                imports.append((int(cumulative) / 1000, name.rstrip()))
+    return timings, imports
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    runs = [measure(args.page) for _ in range(args.runs)]
+    ready = statistics.median(t["ready"] for t, _ in runs)
+    first_run = statistics.median(t["first_run"] for t, _ in runs)
+
+    # Top-level page imports are the least indented lines
+    _, imports = runs[-1]
+    depth = min((len(name) - len(name.lstrip()) for _, name in imports), default=0)
+    page_imports = sum(ms for ms, name in imports if len(name) - len(name.lstrip()) == depth)
+
+    print(f"Page:              {args.page}")
+    print(f"Streamlit import:  {ready:8.1f} ms")
+    print(f"First run:         {first_run:8.1f} ms ({page_imports:.1f} ms of it importing)")
+    print(f"\nSlowest imports during the first run (cumulative ms, last of {args.runs} runs):")
+    for ms, name in sorted(imports, reverse=True)[:args.top]:
+        print(f"  {ms:8.1f}  {name.strip()}")
+
+    if args.budget_ms is not None and first_run > args.budget_ms:
+        sys.exit(f"\nFirst run {first_run:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
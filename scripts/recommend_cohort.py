@@ -0,0 +1,74 @@
+#scripts/recommend_cohort.py
+#
+# Bulk recommendations for a whole school:
+#   python -m scripts.recommend_cohort students.csv results.csv
+#
+# The input needs board, stream, subject_combo and marks columns; any other
+# columns (name, roll number, ...) are carried through to every output row.
+# Students whose board/stream/subject_combo path is not in the catalog, or
+# whose marks are blank or not a number from 0 to 100, get no rows and are
+# listed in <output>_errors.csv.
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine.recommendation_engine import cohort_marks, cohort_on_path, recommend_cohort
+
+REQUIRED_COLUMNS = ["board", "stream", "subject_combo", "marks"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a CSV of students against the course catalog.")
+    parser.add_argument("input", help="Student CSV (board, stream, subject_combo, marks)")
+    parser.add_argument("output", help="Where to write one row per (student, course)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Students read per chunk")
+    return parser.parse_args(argv)
+
+def errors_path(output):
+    return f"{os.path.splitext(output)[0]}_errors.csv"
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    students = rows = skipped = 0
+
+    chunks = pd.read_csv(
+        args.input,
+        chunksize=args.chunksize,
+        dtype={"board": str, "stream": str, "subject_combo": str}
+    )
+    for i, chunk in enumerate(chunks):
+        missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+        if missing:
+            sys.exit(f"Missing columns in {args.input}: {', '.join(missing)}")
+
+        result = recommend_cohort(chunk)
+        result.to_csv(args.output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+        unknown = ~cohort_on_path(chunk)
+        invalid = unknown | np.isnan(cohort_marks(chunk["marks"]))
+        if invalid.any():
+            errors = chunk[invalid]
+            errors.insert(0, "problem", np.where(unknown[invalid], "unknown board/stream/combo", "invalid marks"))
+            errors.insert(0, "row", students + np.flatnonzero(invalid) + 1)
+            errors.to_csv(errors_path(args.output), mode="a" if skipped else "w", header=not skipped, index=False)
+            skipped += len(errors)
+
+        students += len(chunk)
+        rows += len(result)
+        elapsed = time.perf_counter() - started
+        print(f"{students:,} students, {rows:,} rows, {students / elapsed:,.0f} students/sec", file=sys.stderr)
+
+    if skipped:
+        print(f"Skipped {skipped:,} students, listed in {errors_path(args.output)}", file=sys.stderr)
+    elif os.path.exists(errors_path(args.output)):
+        # Left by an earlier run into the same output
+        os.remove(errors_path(args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#service/api_server.py
+#
+# Headless JSON API over the recommendation engine, for partner portals:
+#   python -m service.api_server --port 8080
+#
+#   GET  /boards
+#   GET  /streams?board=CBSE
+#   GET  /combos?stream=Science
+#   GET  /categories?subject_combo=Humanities
+#   GET  /recommend?subject_combo=Humanities&marks=75[&board=CBSE]
+#   POST /recommend   [{"subject_combo": "...", "marks": 75, "board": "CBSE"}, ...]
+#   GET  /metrics     (Prometheus text format)
+#
+# Every route but /metrics also takes tenant=<name> in the query string, to
+# serve that tenant's catalog (see utils/data_loader.py) instead of the
+# default one.
+#
+# Plain asyncio HTTP/1.1 with keep-alive: engine lookups are in-memory and
+# take microseconds, so one event loop serves many connections without
+# extra dependencies. POST batches take milliseconds, so they run on a
+# worker thread, leaving the loop free for every other connection.
+
+import argparse
+import asyncio
+import json
+import math
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from engine.recommendation_engine import (
+    get_boards,
+    get_streams_by_board,
+    get_subject_combinations,
+    get_course_categories,
+    recommend_courses
+)
+from utils.data_loader import tenant, tenant_path
+from utils.metrics import observe_since, prometheus_text
+
+# Seconds a connection gets to send each request, from the request line to
+# the end of its body, including time idle between keep-alive requests
+IDLE_TIMEOUT = 15
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_BATCH = 10_000
+
+# Threads running POST batches. The engine is pure Python, so more would
+# not run batches faster, only take the GIL from the event loop more often.
+BATCH_THREADS = 1
+_batches = ThreadPoolExecutor(max_workers=BATCH_THREADS, thread_name_prefix="api-batch")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _param(query, name):
+    values = query.get(name)
+    if not values:
+        raise HttpError(400, f"Missing query parameter: {name}")
+    return values[0]
+
+def _marks(value):
+    try:
+        # JSON true/false would otherwise pass as 1 and 0
+        marks = None if isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        marks = None
+    if marks is None or not math.isfinite(marks):
+        raise HttpError(400, f"marks must be a number, got {value!r}")
+    return marks
+
+def _recommend_one(item):
+    if not isinstance(item, dict) or "subject_combo" not in item or "marks" not in item:
+        raise HttpError(400, "Each item needs subject_combo and marks")
+    if not isinstance(item["subject_combo"], str):
+        raise HttpError(400, f"subject_combo must be a string, got {item['subject_combo']!r}")
+    board = item.get("board")
+    if board is not None and not isinstance(board, str):
+        raise HttpError(400, f"board must be a string, got {board!r}")
+    return recommend_courses(item["subject_combo"], _marks(item["marks"]), board=board)
+
+def route(method, path, query, body):
+    name = query.get("tenant", [None])[0]
+    if name is not None:
+        try:
+            tenant_path(name)
+        except ValueError as e:
+            raise HttpError(404, str(e))
+    with tenant(name):
+        return _route(method, path, query, body)
+
+def _route(method, path, query, body):
+    if path == "/recommend" and method == "POST":
+        try:
+            items = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "Body must be JSON")
+        if not isinstance(items, list):
+            raise HttpError(400, "Body must be a JSON list")
+        if len(items) > MAX_BATCH:
+            raise HttpError(413, f"At most {MAX_BATCH} items per batch")
+        return [_recommend_one(item) for item in items]
+
+    if method != "GET":
+        raise HttpError(405, f"{method} not allowed on {path}")
+
+    if path == "/health":
+        return {"status": "ok"}
+    if path == "/boards":
+        return get_boards()
+    if path == "/streams":
+        return get_streams_by_board(_param(query, "board"))
+    if path == "/combos":
+        return get_subject_combinations(_param(query, "stream"))
+    if path == "/categories":
+        return get_course_categories(_param(query, "subject_combo"))
+    if path == "/recommend":
+        board = query.get("board")
+        return recommend_courses(_param(query, "subject_combo"), _marks(_param(query, "marks")), board=board[0] if board else None)
+
+    raise HttpError(404, f"No route for {path}")
+
+def _answer(method, url, body, keep_alive):
+    # The response to a routed request, errors included
+    try:
+        status, payload = 200, route(method, url.path, parse_qs(url.query), body)
+    except HttpError as e:
+        status, payload = e.status, {"error": str(e)}
+    except Exception:
+        # A bug in one request must not drop the connection unanswered
+        traceback.print_exc()
+        status, payload = 500, {"error": "Internal server error"}
+    return _response(status, payload, keep_alive)
+
+def _response(status, payload, keep_alive, content_type="application/json"):
+    if content_type == "application/json":
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    else:
+        body = payload.encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: {content_type}; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    method, target, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Body too large")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method, target, body, keep_alive
+
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(_read_request(reader), IDLE_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                break
+            except (ValueError, HttpError) as e:
+                status = e.status if isinstance(e, HttpError) else 400
+                writer.write(_response(status, {"error": str(e) or "Malformed request"}, False))
+                await writer.drain()
+                break
+
+            if request is None:
+                break
+
+            started = time.perf_counter()
+            method, target, body, keep_alive = request
+            url = urlsplit(target)
+            if url.path == "/metrics" and method == "GET":
+                writer.write(_response(200, prometheus_text(), keep_alive, "text/plain"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+                continue
+
+            if method == "POST":
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(_batches, _answer, method, url, body, keep_alive)
+            else:
+                response = _answer(method, url, body, keep_alive)
+
+            observe_since("api.request", started)
+            writer.write(response)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(host, port):
+    server = await asyncio.start_server(handle_connection, host, port, backlog=1024)
+    print(f"Serving recommendations on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the recommendation engine over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#utils/catalog_io.py
+
+# Bulk import and export of the catalog as one flat table, one row per
+# board -> stream -> subject combination -> category -> course path:
+#   board,stream,subject_combo,category,course,min_marks
+#   CBSE,Science,Biology + Mathematics,Medical,MBBS,90
+# A row may leave out leading columns ("Medical,MBBS,90" adds MBBS to an
+# existing category) or trailing ones (a new stream with no combos yet).
+# Each pair of filled neighbouring columns is a link; links and cutoffs
+# that are new are merged into the catalog, nothing is removed. min_marks
+# is a rule's minimum percentage; a rule's other fields (board cutoffs,
+# bands, ...) are kept as they are and not exported.
+#
+# Rows are streamed and checked in one pass. The result is a plan: the
+# errors, a diff for review, and journal ops that commit_changes() writes
+# as a single record. Excel files need openpyxl, which is optional.
+
+import csv
+import io
+import math
+import zipfile
+from importlib.util import find_spec
+
+from engine.eligibility_rules import base_cutoff, with_min_marks
+from utils.journal import set_entry
+
+COLUMNS = ("board", "stream", "subject_combo", "category", "course", "min_marks")
+
+# (column, child column, catalog file listing the children)
+LINKS = (
+    ("board", "stream", "boards.json"),
+    ("stream", "subject_combo", "streams.json"),
+    ("subject_combo", "category", "course_categories.json"),
+    ("category", "course", "courses.json"),
+)
+
+ELIGIBILITY_FILE = "eligibility_rules.json"
+
+# Errors collected before the rest of the file is only counted
+MAX_ERRORS = 50
+
+def excel_supported():
+    return find_spec("openpyxl") is not None
+
+def _column(name):
+    return str(name or "").strip().lower().replace(" ", "_").replace("-", "_")
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def _csv_rows(f):
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    except csv.Error as e:
+        raise ValueError(f"Not a readable CSV file: {e}")
+    finally:
+        # Leave the upload open for the caller
+        text.detach()
+
+def _xlsx_rows(f):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(f, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Not a readable Excel file: {e}")
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def read_rows(f, filename):
+    # Yields (line number, {column: value}) from a binary CSV or XLSX file.
+    # Raises ValueError when the file cannot be read as a catalog table.
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        if not excel_supported():
+            raise ValueError("Excel files need openpyxl (pip install openpyxl); save the sheet as CSV instead")
+        rows = _xlsx_rows(f)
+    else:
+        rows = _csv_rows(f)
+
+    header = [_column(name) for name in next(rows, ())]
+    unknown = [name for name in header if name and name not in COLUMNS]
+    if unknown or "course" not in header:
+        raise ValueError(
+            f"Expected columns {', '.join(COLUMNS)}"
+            + (f"; unknown: {', '.join(unknown)}" if unknown else "")
+        )
+
+    for line, values in enumerate(rows, start=2):
+        yield line, {name: value for name, value in zip(header, values) if name}
+
+def _marks(value):
+    if isinstance(value, str):
+        value = value.strip().rstrip("%")
+    marks = float(value)
+    if not math.isfinite(marks) or not 0 <= marks <= 100:
+        raise ValueError
+    return int(marks) if marks.is_integer() else marks
+
+def plan_import(catalog, rows):
+    # catalog: filename -> data, as from load_catalog(); it is not modified.
+    # Returns {"rows", "errors", "error_count", "added", "cutoffs", "ops"}:
+    # added is file -> key -> [new children] ([] for a new, empty key),
+    # cutoffs is course -> (old, new). There are no ops when a row is invalid.
+    added = {filename: {} for _, _, filename in LINKS}
+    seen = {filename: {} for _, _, filename in LINKS}
+    cutoffs = {}
+    file_cutoffs = {}
+    errors, error_count, count = [], 0, 0
+
+    def error(line, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_ERRORS:
+            errors.append({"Row": line, "Problem": message})
+
+    for line, row in rows:
+        values = [_text(row.get(name)) for name in COLUMNS[:-1]]
+        raw_marks = row.get("min_marks")
+        if not any(values) and _text(raw_marks) == "":
+            continue
+        count += 1
+
+        filled = [i for i, value in enumerate(values) if value]
+        if filled and filled != list(range(filled[0], filled[-1] + 1)):
+            error(line, "Columns between the first and last filled one must not be blank")
+            continue
+
+        course = values[-1]
+        marks = None
+        if _text(raw_marks) != "":
+            if not course:
+                error(line, "min_marks needs a course")
+                continue
+            try:
+                marks = _marks(raw_marks)
+            except (TypeError, ValueError):
+                error(line, f"min_marks must be a number from 0 to 100, got {raw_marks!r}")
+                continue
+            if file_cutoffs.setdefault(course, (marks, line))[0] != marks:
+                error(line, f"{course} already has min_marks {file_cutoffs[course][0]} on row {file_cutoffs[course][1]}")
+                continue
+
+        for (parent, child, filename), parent_value, child_value in zip(LINKS, values, values[1:]):
+            if not parent_value:
+                continue
+            children = seen[filename].get(parent_value)
+            if children is None:
+                # A new board, stream, combo or category gets an entry of its own
+                if parent_value not in catalog[filename]:
+                    added[filename][parent_value] = []
+                children = seen[filename][parent_value] = set(catalog[filename].get(parent_value, ()))
+            if child_value and child_value not in children:
+                children.add(child_value)
+                added[filename].setdefault(parent_value, []).append(child_value)
+
+        if marks is not None:
+            old = catalog[ELIGIBILITY_FILE].get(course)
+            if old is None or base_cutoff(old) != marks:
+                cutoffs[course] = (None if old is None else base_cutoff(old), marks)
+
+    ops = [
+        set_entry(filename, key, list(catalog[filename].get(key, [])) + children)
+        for _, _, filename in LINKS
+        for key, children in added[filename].items()
+    ]
+    ops += [
+        set_entry(ELIGIBILITY_FILE, course, with_min_marks(catalog[ELIGIBILITY_FILE].get(course), new))
+        for course, (_, new) in cutoffs.items()
+    ]
+
+    if error_count:
+        ops = []
+    return {
+        "rows": count,
+        "errors": errors,
+        "error_count": error_count,
+        "added": added,
+        "cutoffs": cutoffs,
+        "ops": ops
+    }
+
+# ======================================================
+# EXPORT
+# ======================================================
+def _paths(catalog, level, key, prefix, expanded, listed):
+    row = prefix + (key,)
+    if level == len(LINKS):
+        listed.add(key)
+        yield row + (base_cutoff(catalog[ELIGIBILITY_FILE].get(key, "")),)
+        return
+
+    children = catalog[LINKS[level][2]].get(key, [])
+    if key in expanded[level] or not children:
+        yield row + ("",) * (len(COLUMNS) - len(row))
+        return
+    expanded[level].add(key)
+    for child in children:
+        yield from _paths(catalog, level + 1, child, row, expanded, listed)
+
+def export_rows(catalog):
+    # Paths from each board down. A stream, combo or category shared by
+    # several parents is spelt out under the first one only, so every link
+    # is written once; entries nothing links to follow with blank leading
+    # columns, then courses that only have a cutoff.
+    expanded = [set() for _ in LINKS]
+    listed = set()
+    for board in catalog["boards.json"]:
+        yield from _paths(catalog, 0, board, (), expanded, listed)
+
+    for level, (_, _, filename) in enumerate(LINKS[1:], start=1):
+        for key in catalog[filename]:
+            if key not in expanded[level]:
+                yield from _paths(catalog, level, key, ("",) * level, expanded, listed)
+
+    for course, marks in catalog[ELIGIBILITY_FILE].items():
+        if course not in listed:
+            yield ("",) * (len(COLUMNS) - 2) + (course, base_cutoff(marks))
+
+def export_csv(catalog):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    writer.writerows(export_rows(catalog))
+    return out.getvalue().encode("utf-8-sig")
+
+def export_xlsx(catalog):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Catalog")
+    sheet.append(COLUMNS)
+    for row in export_rows(catalog):
+        sheet.append(row)
+    out = io.BytesIO()
+    workbook.save(out)
+    return out.getvalue()
@@ -0,0 +1,437 @@
+#utils/compiled_catalog.py
+
+# Binary form of the catalog snapshot files, so processes can start from one
+# mmap instead of parsing five pretty-printed JSON files. The JSON files stay
+# the authoring format; the compiled file records their signatures and is
+# rebuilt whenever they no longer match.
+#
+# Layout (little-endian, every section 8-byte aligned):
+#   magic "CGCATBIN", uint32 format, uint64 meta offset, uint32 meta length
+#   strings    every distinct string once, NUL separated, UTF-8
+#   offsets    uint32[s + 1], where each string starts
+#   per file   "lists":   keys uint32[n], starts uint32[n + 1], items uint32[m]
+#              "ints":    keys uint32[n], values int64[n]
+#              "numbers": keys uint32[n], values float64[n], ints uint32[k]
+#              "json":    keys uint32[n], values uint32[n] (IDs of JSON texts)
+#              then a hash table uint32[2^b]: key position + 1, 0 when empty
+#   meta JSON  source signatures and where each section starts
+# Keys and items are string IDs; starts are offsets into items, so the
+# board -> stream -> combo -> category -> course chain is a set of offset
+# arrays. Integer arrays are read as memoryviews straight over the map.
+#
+# A file can be read two ways: load() decodes it into a plain dict, each
+# distinct name decoded once; view() answers lookups straight from the map
+# (CRC-32 of the key into the hash table), decoding only what is asked for.
+# Views cost a process almost no memory, so every worker on a host can
+# share one copy of the catalog through the page cache.
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import uuid
+import zlib
+from bisect import bisect_left
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from numbers import Real
+
+COMPILED_FILE = "catalog.bin"
+MAGIC = b"CGCATBIN"
+FORMAT = 3
+
+_HEADER = struct.Struct("<8sIQI")
+
+def _align(n):
+    return (n + 7) & ~7
+
+def _kind(data):
+    values = list(data.values())
+    if all(isinstance(v, list) and all(isinstance(s, str) for s in v) for v in values):
+        return "lists"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return "ints"
+    if all(isinstance(v, Real) and not isinstance(v, bool) for v in values):
+        return "numbers"
+    # Anything else, e.g. eligibility rules given as objects, is kept as JSON text
+    return "json"
+
+def _json_text(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+def _hash_table(keys):
+    size = 8
+    while size < 2 * len(keys):
+        size *= 2
+    mask = size - 1
+    table = [0] * size
+    for position, key in enumerate(keys):
+        slot = zlib.crc32(key.encode("utf-8")) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = position + 1
+    return struct.pack(f"<{size}I", *table)
+
+def compile_catalog(path, files, signatures, meta=None):
+    # files: filename -> parsed JSON (any mapping); signatures: filename ->
+    # source signature; meta: extra entries for the meta JSON.
+    # Returns False when the data does not fit the format.
+    ids = {}
+
+    def intern(s):
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(ids)
+        return i
+
+    sections = []
+    meta = dict(meta or {}, sources={f: list(sig) for f, sig in signatures.items()}, files={})
+    meta.setdefault("id", uuid.uuid4().hex)
+    for filename, data in files.items():
+        data = dict(data.items())
+        kind = _kind(data)
+        keys = struct.pack(f"<{len(data)}I", *(intern(k) for k in data))
+        if kind == "lists":
+            starts, items = [0], []
+            for values in data.values():
+                items.extend(intern(s) for s in values)
+                starts.append(len(items))
+            parts = [keys, struct.pack(f"<{len(starts)}I", *starts), struct.pack(f"<{len(items)}I", *items)]
+        elif kind == "ints":
+            parts = [keys, struct.pack(f"<{len(data)}q", *data.values())]
+        elif kind == "json":
+            parts = [keys, struct.pack(f"<{len(data)}I", *(intern(_json_text(v)) for v in data.values()))]
+        else:
+            # Floats, with the positions of the values that were ints
+            values = list(data.values())
+            ints = [i for i, v in enumerate(values) if isinstance(v, int)]
+            parts = [keys, struct.pack(f"<{len(values)}d", *values), struct.pack(f"<{len(ints)}I", *ints)]
+        parts.append(_hash_table(list(data)))
+        meta["files"][filename] = {"kind": kind, "count": len(data), "sections": []}
+        sections.append((filename, parts))
+
+    strings = list(ids)
+    if any("\0" in s for s in strings):
+        return False
+    encoded = [s.encode("utf-8") for s in strings]
+    blob = b"\0".join(encoded)
+    starts, start = [], 0
+    for s in encoded:
+        starts.append(start)
+        start += len(s) + 1
+    starts.append(start)
+    offsets = struct.pack(f"<{len(starts)}I", *starts)
+
+    # Sections follow the fixed header; the meta JSON that locates them goes last
+    layout, offset = [], _HEADER.size
+    meta["strings"] = {"count": len(strings), "section": [offset, len(blob)]}
+    layout.append(blob)
+    offset = _align(offset + len(blob))
+    meta["strings"]["offsets"] = [offset, len(offsets)]
+    layout.append(offsets)
+    offset = _align(offset + len(offsets))
+    for filename, parts in sections:
+        for part in parts:
+            meta["files"][filename]["sections"].append([offset, len(part)])
+            layout.append(part)
+            offset = _align(offset + len(part))
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+
+    # Several processes may publish at once; each writes its own temp file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT, offset, len(meta_bytes)))
+        for part in layout:
+            f.write(part)
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        f.write(meta_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+class CompiledCatalog:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, fmt, meta_offset, meta_len = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or fmt != FORMAT:
+            raise ValueError(f"{path} is not a compiled catalog")
+        self.meta = json.loads(self._map[meta_offset:meta_offset + meta_len])
+        self.sources = {f: tuple(sig) for f, sig in self.meta["sources"].items()}
+        self.id = self.meta["id"]
+        self._view = memoryview(self._map)
+        self._strings = None
+        self._views = {}
+
+        offset, length = self.meta["strings"]["section"]
+        self._blob = self._section(offset, length)
+        self._offsets = self._section(*self.meta["strings"]["offsets"]).cast("I")
+
+    def _section(self, offset, length):
+        return self._view[offset:offset + length]
+
+    def strings(self):
+        # One bulk decode, shared by every file: each name exists once
+        if self._strings is None:
+            offset, length = self.meta["strings"]["section"]
+            text = self._section(offset, length).tobytes().decode("utf-8")
+            self._strings = text.split("\0") if self.meta["strings"]["count"] else []
+        return self._strings
+
+    def string(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1] - 1].tobytes().decode("utf-8")
+
+    def string_equals(self, i, encoded):
+        return self._blob[self._offsets[i]:self._offsets[i + 1] - 1] == encoded
+
+    def view(self, filename, sets=False):
+        # Read-only mapping over one file, shared by every caller; sets=True
+        # gives list values as frozensets
+        key = (filename, sets)
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = CatalogView(self, filename, sets)
+        return view
+
+    def load(self, filename):
+        # Rebuilds the parsed-JSON dict for one file. Every step maps over
+        # the arrays in the file, so no per-entry Python code runs.
+        info = self.meta["files"][filename]
+        parts = [self._section(offset, length) for offset, length in info["sections"]]
+        strings = self.strings()
+        keys = map(strings.__getitem__, parts[0].cast("I"))
+
+        if info["kind"] == "lists":
+            starts = parts[1].cast("I")
+            items = list(map(strings.__getitem__, parts[2].cast("I")))
+            return dict(zip(keys, map(items.__getitem__, map(slice, starts[:-1], starts[1:]))))
+
+        if info["kind"] == "ints":
+            return dict(zip(keys, parts[1].cast("q").tolist()))
+
+        if info["kind"] == "json":
+            # Each distinct text parsed once; objects are parsed per entry
+            # so that no two entries share one
+            texts = parts[1].cast("I")
+            parsed = {i: json.loads(strings[i]) for i in set(texts)}
+            return dict(zip(keys, (
+                json.loads(strings[i]) if isinstance(parsed[i], (dict, list)) else parsed[i]
+                for i in texts
+            )))
+
+        values = parts[1].cast("d").tolist()
+        for i in parts[2].cast("I"):
+            values[i] = int(values[i])
+        return dict(zip(keys, values))
+
+class CatalogView(Mapping):
+    def __init__(self, catalog, filename, sets=False):
+        info = catalog.meta["files"][filename]
+        parts = [catalog._section(offset, length) for offset, length in info["sections"]]
+        self.catalog = catalog
+        self.filename = filename
+        self._kind = info["kind"]
+        self._count = info["count"]
+        self._keys = parts[0].cast("I")
+        self._table = parts[-1].cast("I")
+        self._mask = len(self._table) - 1
+        self._wrap = frozenset if sets else list
+        if self._kind == "lists":
+            self._starts = parts[1].cast("I")
+            self._items = parts[2].cast("I")
+        elif self._kind == "ints":
+            self._values = parts[1].cast("q")
+        elif self._kind == "json":
+            self._values = parts[1].cast("I")
+        else:
+            self._values = parts[1].cast("d")
+            self._ints = parts[2].cast("I")
+
+    def _find(self, key):
+        if not isinstance(key, str):
+            return -1
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            entry = self._table[slot]
+            if not entry:
+                return -1
+            if self.catalog.string_equals(self._keys[entry - 1], encoded):
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def _value(self, position):
+        if self._kind == "lists":
+            items = self._items[self._starts[position]:self._starts[position + 1]]
+            return self._wrap(map(self.catalog.string, items))
+        if self._kind == "json":
+            return json.loads(self.catalog.string(self._values[position]))
+        value = self._values[position]
+        if self._kind == "numbers":
+            i = bisect_left(self._ints, position)
+            if i < len(self._ints) and self._ints[i] == position:
+                return int(value)
+        return value
+
+    def __getitem__(self, key):
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        return self._value(position)
+
+    def get(self, key, default=None):
+        position = self._find(key)
+        return default if position < 0 else self._value(position)
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __iter__(self):
+        return map(self.catalog.string, self._keys)
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        return _Values(self)
+
+    def items(self):
+        return _Items(self)
+
+class _Values(ValuesView):
+    # Positional, so no hash lookups
+    def __iter__(self):
+        return map(self._mapping._value, range(len(self._mapping)))
+
+class _Items(ItemsView):
+    def __iter__(self):
+        return zip(self._mapping, self._mapping.values())
+
+class Overlay(MutableMapping):
+    # Copy-on-write edits over a read-only base mapping (usually a view):
+    # only edited keys take memory. factory, when given, turns base values
+    # into private copies the first time they are read for writing
+    # (overlay[key]); get() always returns the base value unchanged.
+    def __init__(self, base, own=None, gone=None, factory=None):
+        self.base = base
+        self._own = own if own is not None else {}
+        self._gone = gone if gone is not None else set()
+        self._factory = factory
+        self._added = sum(1 for key in self._own if self._at_end(key))
+
+    def _at_end(self, key):
+        # Own keys that are new, or were deleted and set again, iterate
+        # after the base keys, as they would in a dict
+        return key in self._gone or key not in self.base
+
+    def rebase(self, base):
+        # Drop every edit and read from base from now on
+        self.base = base
+        self._own = {}
+        self._gone = set()
+        self._added = 0
+
+    def edited(self):
+        return self._own.keys() | self._gone
+
+    def copy(self):
+        return Overlay(self.base, dict(self._own), set(self._gone), self._factory)
+
+    def get(self, key, default=None):
+        if key in self._own:
+            return self._own[key]
+        if key in self._gone:
+            return default
+        return self.base.get(key, default)
+
+    def __getitem__(self, key):
+        if key in self._own:
+            return self._own[key]
+        if key in self._gone:
+            raise KeyError(key)
+        value = self.base[key]
+        if self._factory is not None:
+            value = self._own[key] = self._factory(value)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._own and self._at_end(key):
+            self._added += 1
+        self._own[key] = value
+
+    def __delitem__(self, key):
+        if key in self._own:
+            if self._at_end(key):
+                self._added -= 1
+            else:
+                self._gone.add(key)
+            del self._own[key]
+        elif self._at_end(key):
+            raise KeyError(key)
+        else:
+            self._gone.add(key)
+
+    def __contains__(self, key):
+        return key in self._own or (key not in self._gone and key in self.base)
+
+    def __iter__(self):
+        gone = self._gone
+        for key in self.base:
+            if key not in gone:
+                yield key
+        for key in self._own:
+            if self._at_end(key):
+                yield key
+
+    def __len__(self):
+        return len(self.base) - len(self._gone) + self._added
+
+    def items(self):
+        return _OverlayItems(self)
+
+class _OverlayItems(ItemsView):
+    # Walks the base's items instead of looking every key up again
+    def __iter__(self):
+        overlay = self._mapping
+        own, gone = overlay._own, overlay._gone
+        for key, value in overlay.base.items():
+            if key not in gone:
+                yield key, own[key] if key in own else value
+        for key, value in own.items():
+            if overlay._at_end(key):
+                yield key, value
+
+def edited_between(old, new):
+    # Keys that can differ between two overlays, without comparing every
+    # key: their own edits, plus what a published catalog changed relative
+    # to the one it was built on. None when that is not known.
+    if not isinstance(old, Overlay) or not isinstance(new, Overlay):
+        return None
+    if old.base is new.base:
+        return old.edited() | new.edited()
+    old_base, new_base = old.base, new.base
+    if not isinstance(old_base, CatalogView) or not isinstance(new_base, CatalogView):
+        return None
+    delta = new_base.catalog.meta.get("delta")
+    if new_base.catalog.meta.get("base") != old_base.catalog.id or delta is None:
+        return None
+    return old.edited() | new.edited() | set(delta.get(new_base.filename, ()))
+
+def open_compiled(base_path, signatures):
+    # The compiled catalog, if it was built from exactly these source files.
+    # Arrays are read in native byte order.
+    if sys.byteorder != "little":
+        return None
+    path = os.path.join(base_path, COMPILED_FILE)
+    try:
+        compiled = CompiledCatalog(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if compiled.sources != signatures:
+        return None
+    return compiled
@@ -1,16 +1,688 @@
 #utils/data_loader.py
 
+import contextvars
+import hashlib
 import json
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from itertools import count
+
+from utils import compiled_catalog, journal
+from utils.metrics import incr, timed
 
 BASE_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
 
-def load_json(filename):
-    path = os.path.join(BASE_PATH, filename)
+CATALOG_FILES = (
+    "boards.json",
+    "streams.json",
+    "course_categories.json",
+    "courses.json",
+    "eligibility_rules.json",
+)
+
+# Files mapping a name to the names it lists; the compiled catalog also
+# holds the reverse of each, under PARENTS_PREFIX + filename
+LINK_FILES = CATALOG_FILES[:4]
+PARENTS_PREFIX = "parents:"
+
+# Journal size that triggers a background compaction into the snapshot files
+COMPACT_AFTER_BYTES = 256 * 1024
+
+# Seconds the engine trusts a store's files before checking them again (a
+# stat per file plus the journal). Edits made in this process show at
+# once; other processes' within this long.
+CHECK_INTERVAL = float(os.environ.get("CAREER_CATALOG_CHECK_SECONDS", "1"))
+
+# Versions whose changed keys a store remembers, for readers catching up
+# with changes_since(); one further behind compares whole files
+CHANGE_LOG_VERSIONS = 256
+
+# Serve the catalog straight from the compiled file's map, shared by every
+# worker process on the host, instead of each worker holding its own copy
+SHARED_CATALOG = os.environ.get("CAREER_SHARED_CATALOG", "0") == "1"
+
+# Catalog versions come from one counter, so a store opened again for the
+# same directory (see TENANTS) never goes back to a version seen before
+_versions = count(1)
+
+def load_json(filename, base_path=None):
+    path = os.path.join(base_path or BASE_PATH, filename)
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def save_json(filename, data):
-    path = os.path.join(BASE_PATH, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def save_json(filename, data, base_path=None):
+    # Whole-file write. Catalog files go through their store so pending
+    # journal edits are not replayed on top of the new content.
+    base_path = base_path or BASE_PATH
+    store = _stores.get(os.path.abspath(base_path))
+    if store is not None and filename in store.filenames:
+        store.replace(filename, data)
+    else:
+        journal.write_json_atomic(os.path.join(base_path, filename), data)
+
+# ======================================================
+# CATALOG STORE
+# ======================================================
+# Parsed catalog files shared by every page and session in the process.
+# The snapshot files plus the edit journal replayed on top of them make up
+# the catalog. Data handed out is treated as read-only: edits go through
+# commit(), which swaps in new objects for the files it touches. Those are
+# copy-on-write overlays (see utils/compiled_catalog.py) over the snapshot,
+# so an edit copies the keys edited since the last compaction, not the file.
+# Snapshots are read from the compiled catalog when it matches the JSON
+# files, and it is recompiled whenever they are read from JSON instead.
+#
+# Every version logs the keys it changed, from the journal ops applied, so
+# readers can follow edits without comparing whole files; a file read
+# again from its snapshot (or replace()d) is logged as changed throughout.
+#
+# With SHARED_CATALOG, files are overlays over views of the compiled
+# catalog, and journal edits land in the overlays. After each commit the
+# catalog is republished, edits included, and every worker's refresh()
+# notices the new file by its signature and swaps all files over to it.
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+def _signature_or_none(path):
+    try:
+        return _file_signature(path)
+    except FileNotFoundError:
+        return None
+
+def _parents(data):
+    # name -> [keys listing it], in catalog order
+    parents = {}
+    for key, values in data.items():
+        for value in values if isinstance(values, list) else ():
+            holders = parents.setdefault(value, [])
+            if not holders or holders[-1] != key:
+                holders.append(key)
+    return parents
+
+# Snapshot files with the same bytes, like the boards.json most tenants copy
+# unchanged, are parsed once and shared by every store that holds them,
+# found by the digest of their content. Like all catalog data they are
+# read-only: an edit gets its store a copy. With SHARED_CATALOG files are
+# views of each directory's own mapped catalog and nothing is shared.
+_documents = {}   # digest -> [data, stores holding it]
+_documents_lock = threading.Lock()
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _shared_document(digest):
+    entry = _documents.get(digest)
+    return None if entry is None else entry[0]
+
+def _edit_copy(data):
+    # A new version of data for journal ops to land in
+    if isinstance(data, compiled_catalog.Overlay):
+        return data.copy()
+    return compiled_catalog.Overlay(data)
+
+def _delta(snapshots, image):
+    # Keys each file changed relative to image, when all of them are
+    # overlays over it
+    delta = {}
+    for filename, data in snapshots.items():
+        if image is None or not isinstance(data, compiled_catalog.Overlay) or data.base is not image.view(filename):
+            return None
+        delta[filename] = list(data.edited())
+    return delta
+
+class CatalogStore:
+    def __init__(self, base_path=None, filenames=CATALOG_FILES):
+        self.base_path = base_path or BASE_PATH
+        self.filenames = filenames
+        self.version = 0
+        self._files = {}
+        self._applied = {}
+        self._pending = set()
+        self._journal_ino = None
+        self._journal_offset = 0
+        self._journal_seq = 0
+        self._compacting = False
+        self._publishing = False
+        self._publish_pending = False
+        self._image = None
+        self._image_signature = None
+        self._digests = {}   # filename -> digest, while its data is shared
+        # (previous version, version, {filename: keys changed, or None for
+        # the whole file}), oldest first
+        self._changes = deque(maxlen=CHANGE_LOG_VERSIONS)
+        self._checked = None   # time.monotonic() of the last refresh()
+        self._closed = False
+        self._lock = threading.RLock()
+
+    def refresh(self):
+        # One stat per file; only snapshots whose signature moved are
+        # re-parsed, and only journal records not yet seen are replayed
+        with self._lock:
+            self._checked = time.monotonic()
+            signatures = {f: _file_signature(os.path.join(self.base_path, f)) for f in self.filenames}
+            reloaded = [
+                f for f in self.filenames
+                if f not in self._files or self._files[f][0] != signatures[f]
+            ]
+
+            # A newly published catalog replaces every file, so all of them
+            # stay overlays over the same one
+            if SHARED_CATALOG and (reloaded or self._image_signature != self._image_path_signature()):
+                reloaded = list(self.filenames)
+
+            if reloaded:
+                state = journal.read_state(self.base_path)
+                snapshots = self._read_snapshots(signatures, state)
+                seqs = [seq for _, seq, _ in snapshots.values() if seq is not None]
+                self._journal_seq = max(self._journal_seq, max(state.values(), default=0), *seqs)
+                for filename in reloaded:
+                    data, seq, digest = snapshots[filename]
+                    self._files[filename] = (signatures[filename], self._hold(filename, data, digest))
+                    self._applied[filename] = state.get(filename, 0) if seq is None else seq
+                    self._pending.discard(filename)
+
+            ino, size = journal.journal_signature(self.base_path)
+            if reloaded or ino != self._journal_ino or size < self._journal_offset:
+                self._journal_ino, self._journal_offset = ino, 0
+
+            changes = dict.fromkeys(reloaded)
+            if size > self._journal_offset:
+                records, self._journal_offset = journal.read_records(self.base_path, self._journal_offset)
+                for filename, keys in self._replay(records).items():
+                    changes.setdefault(filename, keys)
+
+            if changes:
+                incr("catalog.files_reloaded", len(changes))
+                self._advance(changes)
+        return list(changes)
+
+    def refresh_if_stale(self, max_age=CHECK_INTERVAL):
+        # refresh(), unless it ran within the last max_age seconds
+        checked = self._checked
+        if checked is not None and time.monotonic() - checked < max_age:
+            return []
+        return self.refresh()
+
+    def _advance(self, changes):
+        # Under self._lock: a new version, with the keys it changed
+        version = next(_versions)
+        self._changes.append((self.version, version, changes))
+        self.version = version
+
+    def changes_since(self, version):
+        # filename -> keys changed after version, None for a file that may
+        # have changed throughout; None when the log does not reach back
+        # to version
+        with self._lock:
+            if version == self.version:
+                return {}
+            merged = {}
+            for before, _, changes in reversed(self._changes):
+                for filename, keys in changes.items():
+                    if filename not in merged:
+                        merged[filename] = None if keys is None else set(keys)
+                    elif merged[filename] is not None:
+                        if keys is None:
+                            merged[filename] = None
+                        else:
+                            merged[filename] |= keys
+                if before == version:
+                    return merged
+            return None
+
+    def load_since(self, version):
+        # (files, their version, changes_since(version)), read together
+        with self._lock:
+            files = self.load()
+            return files, self.version, self.changes_since(version)
+
+    def _image_path_signature(self):
+        return _signature_or_none(os.path.join(self.base_path, compiled_catalog.COMPILED_FILE))
+
+    def _read_snapshots(self, signatures, state):
+        # filename -> (data, journal seq the data includes or None when the
+        # snapshot file's own state applies, digest of the snapshot file
+        # when data is its content and can be shared, else None)
+        self._image_signature = self._image_path_signature()
+        compiled = compiled_catalog.open_compiled(self.base_path, signatures)
+        if compiled is None:
+            snapshots, digests = {}, {}
+            for filename in self.filenames:
+                raw = _read_bytes(os.path.join(self.base_path, filename))
+                digests[filename] = _digest(raw)
+                data = None if SHARED_CATALOG else _shared_document(digests[filename])
+                snapshots[filename] = json.loads(raw) if data is None else data
+            self._compile(snapshots, signatures, digests=digests)
+            if not SHARED_CATALOG:
+                return {f: (snapshots[f], None, digests[f]) for f in self.filenames}
+            self._image_signature = self._image_path_signature()
+            compiled = compiled_catalog.open_compiled(self.base_path, signatures)
+            if compiled is None:
+                self._image = None
+                return {f: (snapshots[f], None, None) for f in self.filenames}
+        else:
+            incr("catalog.compiled_loads")
+
+        seq = compiled.meta.get("seq")
+        if SHARED_CATALOG:
+            self._image = compiled
+            self._image_signature = compiled.signature
+            return {f: (compiled_catalog.Overlay(compiled.view(f)), seq, None) for f in self.filenames}
+
+        snapshots = {}
+        digests = compiled.meta.get("digests") or {}
+        for filename in self.filenames:
+            if seq is not None and state.get(filename, 0) < seq:
+                # Published with journal edits the snapshot file lacks
+                snapshots[filename] = (compiled.load(filename), seq, None)
+                continue
+            digest = digests.get(filename) or _digest(_read_bytes(os.path.join(self.base_path, filename)))
+            data = _shared_document(digest)
+            snapshots[filename] = (compiled.load(filename) if data is None else data, None, digest)
+        return snapshots
+
+    def _hold(self, filename, data, digest):
+        # The data to keep for filename: the shared copy of its document when
+        # there is one, else data, shared from now on when digest is given
+        self._release(filename)
+        if digest is None or self._closed:
+            return data
+        with _documents_lock:
+            entry = _documents.get(digest)
+            if entry is None:
+                entry = _documents[digest] = [data, 0]
+            elif entry[0] is not data:
+                incr("catalog.documents_shared")
+            entry[1] += 1
+        self._digests[filename] = digest
+        return entry[0]
+
+    def _release(self, filename):
+        digest = self._digests.pop(filename, None)
+        if digest is None:
+            return
+        with _documents_lock:
+            entry = _documents[digest]
+            entry[1] -= 1
+            if not entry[1]:
+                del _documents[digest]
+
+    def close(self):
+        # Stop sharing this store's documents. Sessions still holding the
+        # store can finish with it; get_store() opens a new one.
+        with self._lock:
+            self._closed = True
+            for filename in list(self._digests):
+                self._release(filename)
+
+    def documents(self):
+        # key -> bytes of each loaded file, as its snapshot file's size.
+        # Shared documents are keyed by digest, so a sum over several
+        # stores counts them once. Lock-free: a store loading meanwhile
+        # does not hold up the caller.
+        return {
+            self._digests.get(filename) or (id(self), filename): signature[1]
+            for filename, (signature, _) in list(self._files.items())
+        }
+
+    def _compile(self, snapshots, signatures, seq=None, image=None, digests=None):
+        # Writes the compiled catalog, with the parents of every link file.
+        # seq: journal seq the snapshots include, when past their files' state.
+        # digests: snapshot file -> digest, for files the snapshots match.
+        path = os.path.join(self.base_path, compiled_catalog.COMPILED_FILE)
+        files = dict(snapshots)
+        for filename in LINK_FILES:
+            files[PARENTS_PREFIX + filename] = _parents(snapshots[filename])
+        meta = {"seq": seq}
+        if digests:
+            meta["digests"] = digests
+        delta = _delta(snapshots, image)
+        if delta is not None:
+            meta.update(base=image.id, delta=delta)
+        try:
+            with timed("catalog.compile"):
+                return compiled_catalog.compile_catalog(path, files, signatures, meta)
+        except OSError:
+            # Read-only data directory: keep serving from the JSON files
+            return False
+
+    def compile(self):
+        # Rebuild the compiled catalog from the JSON snapshot files now
+        signatures = {f: _file_signature(os.path.join(self.base_path, f)) for f in self.filenames}
+        raw = {f: _read_bytes(os.path.join(self.base_path, f)) for f in self.filenames}
+        snapshots = {f: json.loads(data) for f, data in raw.items()}
+        digests = {f: _digest(data) for f, data in raw.items()}
+        path = os.path.join(self.base_path, compiled_catalog.COMPILED_FILE)
+        return path if self._compile(snapshots, signatures, digests=digests) else None
+
+    def publish(self):
+        # Compile the catalog as this process has it, journal edits included,
+        # for every worker to map. Readers notice the new file on refresh().
+        with self._lock:
+            self.refresh()
+            snapshots = {f: self._files[f][1] for f in self.filenames}
+            signatures = {f: self._files[f][0] for f in self.filenames}
+            seq, image = self._journal_seq, self._image
+        with timed("catalog.publish"):
+            self._compile(snapshots, signatures, seq, image)
+
+    def publish_in_background(self):
+        # Commits in quick succession share one publish
+        with self._lock:
+            self._publish_pending = True
+            if self._publishing:
+                return
+            self._publishing = True
+
+        def run():
+            try:
+                while True:
+                    with self._lock:
+                        if not self._publish_pending:
+                            return
+                        self._publish_pending = False
+                    self.publish()
+            finally:
+                self._publishing = False
+
+        threading.Thread(target=run, name="catalog-publish", daemon=True).start()
+
+    def _replay(self, records):
+        # filename -> keys the records changed
+        changed, keys = {}, {}
+        for record in records:
+            for op in record["ops"]:
+                filename = op["file"]
+                if record["seq"] <= self._applied.get(filename, 0):
+                    continue
+                if filename not in changed:
+                    changed[filename] = _edit_copy(self._files[filename][1])
+                    keys[filename] = set()
+                journal.apply_op(changed[filename], op)
+                keys[filename].add(op["key"])
+
+            self._journal_seq = max(self._journal_seq, record["seq"])
+
+        for filename, data in changed.items():
+            self._release(filename)
+            self._files[filename] = (self._files[filename][0], data)
+            self._pending.add(filename)
+        for filename in self.filenames:
+            self._applied[filename] = max(self._applied.get(filename, 0), self._journal_seq)
+        return keys
+
+    def commit(self, ops):
+        # All ops land in one journal line: a cascade is applied entirely or not at all
+        with timed("catalog.commit"), journal.locked(self.base_path):
+            record = self._commit_locked(ops)
+        if self._journal_offset > COMPACT_AFTER_BYTES:
+            self.compact_in_background()
+        elif SHARED_CATALOG:
+            self.publish_in_background()
+        return record
+
+    def _commit_locked(self, ops):
+        with self._lock:
+            self.refresh()
+
+            working = {}
+            filled = []
+            for op in ops:
+                filename = op["file"]
+                if filename not in working:
+                    # Only read for the old values; _replay() makes the new version
+                    working[filename] = compiled_catalog.Overlay(self._files[filename][1])
+                data = working[filename]
+
+                op = dict(op)
+                op.pop("old", None)
+                if op["key"] in data:
+                    op["old"] = data[op["key"]]
+                journal.apply_op(data, op)
+                filled.append(op)
+
+            record = {"seq": self._journal_seq + 1, "ts": time.time(), "ops": filled}
+            self._journal_offset = journal.append_record(self.base_path, record, self._journal_offset)
+            self._journal_ino, _ = journal.journal_signature(self.base_path)
+            self._advance(self._replay([record]))
+        return record
+
+    def rollback(self, seq):
+        # Undo every edit after seq by journaling their inverse as one new edit
+        with journal.locked(self.base_path):
+            later = [r for r in journal.history(self.base_path) if r["seq"] > seq]
+            ops = [journal.inverse(op) for r in reversed(later) for op in reversed(r["ops"])]
+            if not ops:
+                return None
+            return self._commit_locked(ops)
+
+    def history(self):
+        return journal.history(self.base_path)
+
+    def replace(self, filename, data):
+        with journal.locked(self.base_path), self._lock:
+            self.refresh()
+            path = os.path.join(self.base_path, filename)
+            journal.write_json_atomic(path, data)
+
+            state = journal.read_state(self.base_path)
+            state[filename] = self._journal_seq
+            journal.write_state(self.base_path, state)
+
+            self._release(filename)
+            self._files[filename] = (_file_signature(path), data)
+            self._applied[filename] = self._journal_seq
+            self._pending.discard(filename)
+            self._advance({filename: None})
+            if SHARED_CATALOG:
+                # Recompiled and mapped again on the next refresh
+                self._files.pop(filename)
+
+    def compact(self):
+        # Fold the journal into the snapshot files and archive its records.
+        # Replay is idempotent, so a crash at any step leaves a valid catalog.
+        with timed("catalog.compact"), journal.locked(self.base_path), self._lock:
+            self.refresh()
+            if not self._journal_offset:
+                return
+
+            for filename in sorted(self._pending):
+                path = os.path.join(self.base_path, filename)
+                data = self._files[filename][1]
+                merged = dict(data.items())
+                journal.write_json_atomic(path, merged)
+                if not SHARED_CATALOG:
+                    # A snapshot file again, so its document can be shared,
+                    # and later edits overlay it afresh
+                    data = self._hold(filename, merged, _digest(_read_bytes(path)))
+                self._files[filename] = (_file_signature(path), data)
+
+            journal.write_state(self.base_path, {f: self._journal_seq for f in self.filenames})
+            journal.rotate(self.base_path, self._journal_offset)
+
+            # Every file now matches its snapshot, so the compiled catalog can
+            # be rebuilt from memory
+            self._compile(
+                {f: self._files[f][1] for f in self.filenames},
+                {f: self._files[f][0] for f in self.filenames},
+                self._journal_seq,
+                self._image,
+                dict(self._digests)
+            )
+
+            self._pending.clear()
+            self._journal_ino, _ = journal.journal_signature(self.base_path)
+            self._journal_offset = 0
+
+    def compact_in_background(self):
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, name="catalog-compaction", daemon=True).start()
+
+    def load(self):
+        with self._lock:
+            self.refresh()
+            return {filename: self._files[filename][1] for filename in self.filenames}
+
+def parents_of(catalog):
+    # filename -> read-only view of its parents index, from the shared
+    # compiled catalog that every link file in catalog overlays; else None
+    image = None
+    for filename in LINK_FILES:
+        data = catalog[filename]
+        if not isinstance(data, compiled_catalog.Overlay) or not isinstance(data.base, compiled_catalog.CatalogView):
+            return None
+        if image is None:
+            image = data.base.catalog
+        elif data.base.catalog is not image:
+            return None
+    return {f: image.view(PARENTS_PREFIX + f, sets=True) for f in LINK_FILES}
+
+_stores = {}
+
+def use_data_dir(path):
+    # Point the default store (and so the engine) at another catalog
+    # directory, e.g. a generated one for benchmarks
+    global BASE_PATH
+    BASE_PATH = path
+
+def get_store(base_path=None):
+    # The store for base_path; by default the current tenant's, or with
+    # no tenant set the default catalog's
+    if base_path is None:
+        name = _tenant.get()
+        if name is not None:
+            return _tenant_store(name)
+    base_path = base_path or BASE_PATH
+    key = os.path.abspath(base_path)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores.setdefault(key, CatalogStore(base_path))
+    return store
+
+# ======================================================
+# TENANTS
+# ======================================================
+# Schools and coaching centres hosted by one process, each with its own
+# catalog directory under TENANTS_DIR, named after the tenant. A session
+# (or request) picks its tenant with use_tenant() or tenant(); get_store()
+# and everything built on it, the engine included, then serve that
+# tenant's catalog. A tenant's store is opened on first use, and opening
+# one closes the least recently used others while the catalog files they
+# have loaded (shared documents counted once) would go past
+# CAREER_TENANT_CATALOG_MB. The budget counts snapshot file bytes only:
+# engine tables, search index and cached views come on top, and a tenant
+# in full use holds about 20 times its file bytes. A closed tenant is
+# loaded again on its next use.
+TENANTS_DIR = os.environ.get("CAREER_TENANTS_DIR", os.path.join(os.path.dirname(__file__), "..", "tenants"))
+TENANT_CATALOG_BYTES = int(float(os.environ.get("CAREER_TENANT_CATALOG_MB", "64")) * 2**20)
+
+_TENANT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+_tenant = contextvars.ContextVar("tenant", default=None)
+_tenant_stores = OrderedDict()   # name -> store, least recently used first
+_tenants_lock = threading.Lock()
+
+def tenant_path(name):
+    # Raises ValueError for a name that is not a tenant
+    path = os.path.join(TENANTS_DIR, name) if _TENANT_NAME.fullmatch(name or "") else None
+    if path is None or not os.path.isdir(path):
+        raise ValueError(f"No catalog for tenant {name!r}")
+    return path
+
+def list_tenants():
+    try:
+        names = os.listdir(TENANTS_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if _TENANT_NAME.fullmatch(name) and os.path.isdir(os.path.join(TENANTS_DIR, name)))
+
+def use_tenant(name):
+    # The tenant of this thread or task from now on; None for the default catalog
+    if name is not None and name not in _tenant_stores:
+        tenant_path(name)
+    _tenant.set(name)
+
+@contextmanager
+def tenant(name):
+    # use_tenant() for the duration of a with block
+    if name is not None and name not in _tenant_stores:
+        tenant_path(name)
+    token = _tenant.set(name)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+def _tenant_bytes():
+    loaded = {}
+    for store in _tenant_stores.values():
+        loaded.update(store.documents())
+    return sum(loaded.values())
+
+def _evict(incoming):
+    # Under _tenants_lock
+    while _tenant_stores and _tenant_bytes() + incoming > TENANT_CATALOG_BYTES:
+        _, store = _tenant_stores.popitem(last=False)
+        key = os.path.abspath(store.base_path)
+        if _stores.get(key) is store:
+            del _stores[key]
+        store.close()
+        incr("tenants.evicted")
+
+def _tenant_store(name):
+    with _tenants_lock:
+        store = _tenant_stores.get(name)
+        if store is not None:
+            _tenant_stores.move_to_end(name)
+            return store
+
+        path = tenant_path(name)
+        signatures = [_signature_or_none(os.path.join(path, f)) for f in CATALOG_FILES]
+        _evict(sum(signature[1] for signature in signatures if signature))
+        store = _tenant_stores[name] = get_store(path)
+        incr("tenants.opened")
+    return store
+
+def tenant_status():
+    # Open tenants, least recently used first, the bytes of catalog files
+    # they hold, and every tenant with a catalog directory
+    available = list_tenants()
+    with _tenants_lock:
+        return {"tenants": list(_tenant_stores), "bytes": _tenant_bytes(), "budget": TENANT_CATALOG_BYTES, "available": available}
+
+def load_catalog():
+    return get_store().load()
+
+def catalog_version():
+    store = get_store()
+    store.refresh()
+    return store.version
+
+def commit_changes(ops):
+    return get_store().commit(ops)
+
+def rollback_catalog(seq):
+    return get_store().rollback(seq)
+
+def catalog_history():
+    return get_store().history()
@@ -0,0 +1,134 @@
+#utils/journal.py
+
+# Append-only log of catalog edits, one JSON line per admin action:
+#   {"seq": 7, "ts": 1700000000.0, "ops": [{"file": ..., "key": ..., "value": ..., "old": ...}]}
+# An op without "value" deletes the key; "old" is absent when the key did
+# not exist. Ops set whole values, so replaying a record twice is harmless,
+# and "old" makes every record invertible for rollback.
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+JOURNAL_FILE = "catalog.journal"
+ARCHIVE_FILE = "catalog.journal.archive"
+STATE_FILE = "catalog.journal.state"
+LOCK_FILE = "catalog.journal.lock"
+
+_thread_lock = threading.Lock()
+
+def set_entry(filename, key, value):
+    return {"file": filename, "key": key, "value": value}
+
+def delete_entry(filename, key):
+    return {"file": filename, "key": key}
+
+def inverse(op):
+    if "old" in op:
+        return set_entry(op["file"], op["key"], op["old"])
+    return delete_entry(op["file"], op["key"])
+
+def apply_op(data, op):
+    # data is a private copy owned by the caller
+    if "value" in op:
+        data[op["key"]] = op["value"]
+    else:
+        data.pop(op["key"], None)
+
+@contextmanager
+def locked(base_path):
+    # Serializes writers across threads and processes; readers never lock
+    with _thread_lock:
+        with open(os.path.join(base_path, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+def journal_signature(base_path):
+    try:
+        st = os.stat(os.path.join(base_path, JOURNAL_FILE))
+    except FileNotFoundError:
+        return None, 0
+    return st.st_ino, st.st_size
+
+def read_records(base_path, offset=0, filename=JOURNAL_FILE):
+    # A torn last line (crash mid-append) has no newline and is not committed
+    try:
+        f = open(os.path.join(base_path, filename), "rb")
+    except FileNotFoundError:
+        return [], offset
+
+    records = []
+    with f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            offset += len(line)
+    return records, offset
+
+def append_record(base_path, record, offset):
+    # Caller holds locked() and has read the journal up to offset
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    path = os.path.join(base_path, JOURNAL_FILE)
+    with open(path, "ab") as f:
+        if f.tell() > offset:
+            f.truncate(offset)
+        f.write(line.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    return offset + len(line.encode("utf-8"))
+
+def history(base_path):
+    archived, _ = read_records(base_path, filename=ARCHIVE_FILE)
+    current, _ = read_records(base_path)
+    return archived + current
+
+def read_state(base_path):
+    # filename -> last seq already folded into that snapshot file
+    try:
+        with open(os.path.join(base_path, STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def write_json_atomic(path, data, indent=2):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_state(base_path, state):
+    write_json_atomic(os.path.join(base_path, STATE_FILE), state, indent=None)
+
+def rotate(base_path, offset):
+    # Move compacted records to the archive and start an empty journal.
+    # Caller holds locked() and has already written snapshots and state.
+    path = os.path.join(base_path, JOURNAL_FILE)
+    with open(path, "rb") as f:
+        compacted = f.read(offset)
+
+    with open(os.path.join(base_path, ARCHIVE_FILE), "ab") as f:
+        f.write(compacted)
+        f.flush()
+        os.fsync(f.fileno())
+
+    tmp_path = f"{path}.tmp"
+    open(tmp_path, "wb").close()
+    os.replace(tmp_path, path)
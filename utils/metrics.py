@@ -0,0 +1,174 @@
+#utils/metrics.py
+
+# Per-process phase timers and counters. Each observation is two
+# perf_counter() calls, a bisect and a locked increment, cheap enough to
+# leave on in production. Set CAREER_METRICS=0 to turn it off.
+#
+#   with timed("student.recommend"):
+#       ...
+#
+# prometheus_text() renders everything in the Prometheus text format, and
+# an aggregated JSON line is logged to "career_guidance.metrics" at most
+# once every LOG_INTERVAL seconds (CAREER_METRICS_LOG_INTERVAL). The lines
+# go to stderr, or to the file named by CAREER_METRICS_LOG; set
+# CAREER_METRICS_LOG=0 to leave the logger to the host's own logging
+# setup. Functions wrapped in timed_function() can also be profiled on
+# demand; see utils/profiler.py.
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+from utils import profiler
+
+ENABLED = os.environ.get("CAREER_METRICS", "1") != "0"
+LOG_INTERVAL = float(os.environ.get("CAREER_METRICS_LOG_INTERVAL", "60"))
+LOG_TARGET = os.environ.get("CAREER_METRICS_LOG", "stderr")
+
+# Upper bounds in seconds; the last bucket is +Inf
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("career_guidance.metrics")
+
+def _configure_logging():
+    # Neither the Streamlit pages nor the API server configure logging, and
+    # the root logger's default WARNING level would drop every line
+    if not ENABLED or LOG_TARGET == "0" or logger.handlers:
+        return
+    handler = logging.StreamHandler() if LOG_TARGET == "stderr" else logging.FileHandler(LOG_TARGET, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_configure_logging()
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_last_log = time.monotonic()
+
+def observe(phase, seconds):
+    global _last_log
+    if not ENABLED:
+        return
+
+    with _lock:
+        hist = _histograms.get(phase)
+        if hist is None:
+            hist = _histograms[phase] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        hist[0][bisect_left(BUCKETS, seconds)] += 1
+        hist[1] += seconds
+        hist[2] += 1
+
+        now = time.monotonic()
+        due = now - _last_log >= LOG_INTERVAL
+        if due:
+            _last_log = now
+
+    if due:
+        log_snapshot()
+
+def observe_since(phase, started):
+    observe(phase, time.perf_counter() - started)
+
+def incr(counter, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[counter] = _counters.get(counter, 0) + n
+
+@contextmanager
+def timed(phase):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(phase, time.perf_counter() - started)
+
+def timed_function(phase):
+    # Profiled as the target named by the phase's prefix ("engine.x": "engine")
+    target = phase.split(".")[0]
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                if profiler.active is not None:
+                    return profiler.call(target, fn, *args, **kwargs)
+                return fn(*args, **kwargs)
+            finally:
+                observe(phase, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+def _quantile(counts, total, q):
+    # Upper bound of the bucket holding the q-th observation
+    rank = q * total
+    seen = 0
+    for bound, count in zip(BUCKETS + (float("inf"),), counts):
+        seen += count
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+def snapshot():
+    with _lock:
+        histograms = {phase: (list(h[0]), h[1], h[2]) for phase, h in _histograms.items()}
+        counters = dict(_counters)
+
+    return {
+        "phases": {
+            phase: {
+                "count": count,
+                "sum_seconds": total,
+                "mean_ms": total / count * 1000 if count else 0.0,
+                "p50_ms": _quantile(counts, count, 0.50) * 1000,
+                "p95_ms": _quantile(counts, count, 0.95) * 1000,
+                "p99_ms": _quantile(counts, count, 0.99) * 1000,
+            }
+            for phase, (counts, total, count) in sorted(histograms.items())
+        },
+        "counters": dict(sorted(counters.items())),
+    }
+
+def log_snapshot():
+    logger.info(json.dumps({"event": "metrics", "ts": time.time(), "pid": os.getpid(), **snapshot()}))
+
+def prometheus_text():
+    with _lock:
+        histograms = {phase: (list(h[0]), h[1], h[2]) for phase, h in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = [
+        "# HELP career_phase_seconds Time spent in each app, admin and engine phase",
+        "# TYPE career_phase_seconds histogram",
+    ]
+    for phase, (counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'career_phase_seconds_bucket{{phase="{phase}",le="{le}"}} {cumulative}')
+        lines.append(f'career_phase_seconds_sum{{phase="{phase}"}} {total}')
+        lines.append(f'career_phase_seconds_count{{phase="{phase}"}} {count}')
+
+    lines += [
+        "# HELP career_events_total Counted events",
+        "# TYPE career_events_total counter",
+    ]
+    for counter, n in sorted(counters.items()):
+        lines.append(f'career_events_total{{event="{counter}"}} {n}')
+
+    return "\n".join(lines) + "\n"
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
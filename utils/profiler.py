@@ -0,0 +1,286 @@
+#utils/profiler.py
+
+# On-demand profiling, armed from the admin Dashboard for the next N runs
+# of a target in this server process:
+#   "app"     reruns of app.py, from begin() at the top of the script to
+#             end() wherever it finishes
+#   "engine"  calls of functions wrapped in timed_function() with an
+#             "engine." phase; calls they make to each other count once
+# in one of two modes:
+#   "cprofile"  every call, through cProfile: saved as pstats and as
+#               collapsed stacks built from its call graph (microseconds)
+#   "sampling"  the running stack every SAMPLE_INTERVAL seconds, read by a
+#               background thread: collapsed stacks (samples) only
+# Collapsed stacks are "outer;...;inner value" lines, the input of
+# flamegraph.pl and speedscope. Captures are saved under
+# CAREER_PROFILE_DIR (default profiles/ in the project), with a .json
+# record of what was captured; the oldest go past MAX_CAPTURES.
+#
+# Disarmed, a hook is one global read.
+
+import cProfile
+import glob
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_DIR = os.environ.get("CAREER_PROFILE_DIR", os.path.join(os.path.dirname(__file__), "..", "profiles"))
+MAX_CAPTURES = 50
+SAMPLE_INTERVAL = 0.005
+
+TARGETS = ("app", "engine")
+MODES = ("cprofile", "sampling")
+
+# Stacks more than this deep are cut at the bottom; call graph paths
+# worth less than a microsecond are left out
+MAX_DEPTH = 64
+
+# The armed capture, or None
+active = None
+_lock = threading.Lock()
+
+def _label(filename, line, name):
+    # Short and free of the ";" that separates stack frames
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+class _Capture:
+    def __init__(self, target, mode, runs):
+        self.target = target
+        self.mode = mode
+        self.runs = runs
+        self.begun = 0
+        self.done = 0
+        self.seconds = 0.0
+        self.stats = None
+        self.stacks = Counter()
+        self._open = {}   # thread id -> (profile or None, root frame, started)
+        self._saved = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        if mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def _due(self):
+        # Under self._lock: every run finished and the capture not yet saved
+        due = self.done >= self.runs and not self._open and not self._saved
+        self._saved |= due
+        return due
+
+    def begin(self, root):
+        thread = threading.get_ident()
+        token = None
+        with self._lock:
+            if thread in self._open and self.target == "engine":
+                # An engine call made by another one is part of it
+                return None
+            if thread in self._open:
+                # A rerun still open on its thread stopped early; close it
+                self._finish(thread)
+            profile = None
+            if self.begun < self.runs:
+                profile = cProfile.Profile() if self.mode == "cprofile" else None
+                self.begun += 1
+                self._open[thread] = (profile, root, time.perf_counter())
+                token = (self, thread)
+            due = self._due()
+        if due:
+            _save(self)
+
+        # Last, so that little of the profiler itself is recorded
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler holds the interpreter's hook; the run counts, unprofiled
+                with self._lock:
+                    self._open[thread] = (None, root, self._open[thread][2])
+        return token
+
+    def end(self, thread):
+        with self._lock:
+            if thread in self._open:
+                self._finish(thread)
+            due = self._due()
+        if due:
+            _save(self)
+
+    def close(self):
+        # No more runs; saved once those under way finish
+        with self._lock:
+            self.runs = self.begun
+            due = self._due()
+        if due:
+            _save(self)
+
+    def _finish(self, thread):
+        profile, _, started = self._open.pop(thread)
+        self.seconds += time.perf_counter() - started
+        self.done += 1
+        if profile is not None:
+            profile.disable()
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frames = sys._current_frames()
+            with self._lock:
+                running = [(thread, root) for thread, (_, root, _) in self._open.items()]
+            for thread, root in running:
+                frame = frames.get(thread)
+                stack = []
+                while frame is not None and frame is not root and len(stack) < MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                self.stacks[";".join([self.target] + stack[::-1])] += 1
+
+    def folded(self):
+        if self.mode == "sampling":
+            return self.stacks
+        return _stats_folded(self.stats, self.target) if self.stats else Counter()
+
+def _stats_folded(stats, root):
+    # cProfile keeps caller -> callee edges, not whole stacks, so each
+    # function's time is split over the paths to it in proportion to the
+    # time its callers spent calling it. The profiler's own calls, between
+    # enable() and disable(), are left out.
+    own = {func for func in stats.stats if func[0] == __file__ or "_lsprof" in func[2]}
+    entries = {
+        func: entry for func, entry in stats.stats.items()
+        if func not in own and not (entry[4] and entry[4].keys() <= own)
+    }
+    # Time a function's callers do not account for, e.g. calls from frames
+    # entered before profiling started, starts a stack of its own
+    children = {}
+    unaccounted = {func: entry[3] for func, entry in entries.items()}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            if caller in entries and caller != func:
+                children.setdefault(caller, []).append((func, edge[3]))
+                unaccounted[func] -= edge[3]
+
+    folded = Counter()
+    pending = [(func, seconds, root, (func,)) for func, seconds in unaccounted.items()]
+    while pending:
+        func, seconds, path, on_path = pending.pop()
+        total = entries[func][3]
+        if seconds < 1e-6 or not total:
+            continue
+        path = f"{path};{_label(*func)}"
+        share = seconds / total
+        folded[path] += round(entries[func][2] * share * 1e6)
+        if len(on_path) < MAX_DEPTH:
+            pending.extend(
+                (child, edge * share, path, on_path + (child,))
+                for child, edge in children.get(func, ())
+                if child not in on_path
+            )
+    return Counter({path: us for path, us in folded.items() if us > 0})
+
+def _save(capture):
+    global active
+
+    with _lock:
+        if active is capture:
+            active = None
+    capture._stop.set()
+    if capture._sampler is not None:
+        capture._sampler.join()
+    if not capture.done:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    now = time.time()
+    name = f"{capture.target}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}-{capture.mode}"
+    base = os.path.join(PROFILE_DIR, name)
+    files = {"folded": base + ".folded"}
+    with open(files["folded"], "w", encoding="utf-8") as f:
+        f.writelines(f"{path} {value}\n" for path, value in sorted(capture.folded().items()))
+    if capture.stats is not None:
+        files["pstats"] = base + ".pstats"
+        capture.stats.dump_stats(files["pstats"])
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({
+            "name": name,
+            "target": capture.target,
+            "mode": capture.mode,
+            "runs": capture.done,
+            "seconds": capture.seconds,
+            "created": now,
+            "files": {kind: os.path.basename(path) for kind, path in files.items()}
+        }, f)
+
+    for old in list_captures()[MAX_CAPTURES:]:
+        for path in [old["path"], *old["files"].values()]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def arm(target, runs, mode="cprofile"):
+    # Replaces a capture already armed, saving what it has
+    global active
+
+    if target not in TARGETS or mode not in MODES or runs < 1:
+        raise ValueError(f"Cannot profile {runs} run(s) of {target!r} in mode {mode!r}")
+    with _lock:
+        previous, active = active, _Capture(target, mode, runs)
+    if previous is not None:
+        previous.close()
+
+def disarm():
+    # Stops the armed capture; the runs it began are saved once they finish
+    global active
+
+    with _lock:
+        capture, active = active, None
+    if capture is not None:
+        capture.close()
+
+def status():
+    capture = active
+    if capture is None:
+        return None
+    return {"target": capture.target, "mode": capture.mode, "runs": capture.runs, "done": capture.done}
+
+def begin(target):
+    # Token for end(); None unless a capture of target wants this run
+    capture = active
+    if capture is None or capture.target != target:
+        return None
+    return capture.begin(sys._getframe(1))
+
+def end(token):
+    if token is not None:
+        capture, thread = token
+        capture.end(thread)
+
+def call(target, fn, *args, **kwargs):
+    token = begin(target)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        end(token)
+
+def list_captures():
+    # Saved captures, newest first, with absolute file paths
+    captures = []
+    for path in glob.glob(os.path.join(PROFILE_DIR, "*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        record["path"] = path
+        record["files"] = {kind: os.path.join(PROFILE_DIR, name) for kind, name in record["files"].items()}
+        captures.append(record)
+    return sorted(captures, key=lambda record: record["created"], reverse=True)
@@ -0,0 +1,78 @@
+#utils/view_cache.py
+
+# Derived view models (the tables a page renders), shared by every session
+# in the server process. Entries are keyed on what they are built from,
+# under the catalog version they were built at, in a scope per catalog
+# (the tenant, see utils/data_loader.py). Versions only go up: the first
+# lookup at a newer version drops every entry of its scope, so nothing built
+# from an older catalog is served again. Least recently used entries, of
+# any scope, are evicted past a memory budget, CAREER_VIEW_CACHE_MB
+# (default 64).
+#
+#   table = cached_view(catalog_version(), ("landscape", subject_combo), build, scope=tenant_name)
+
+import os
+import threading
+from collections import OrderedDict
+
+from utils.metrics import incr
+
+MAX_BYTES = int(float(os.environ.get("CAREER_VIEW_CACHE_MB", "64")) * 2**20)
+
+class ViewCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.versions = {}   # scope -> version of its entries
+        self._entries = OrderedDict()   # (scope, key) -> (value, bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _advance(self, scope, version):
+        # The scope's version after seeing version
+        current = self.versions.get(scope)
+        if current is None or version > current:
+            if current is not None:
+                for key in [key for key in self._entries if key[0] == scope]:
+                    self.bytes -= self._entries.pop(key)[1]
+            current = self.versions[scope] = version
+        return current
+
+    def get_or_build(self, version, key, build, size, scope=None):
+        # version must be read before build() looks at the catalog, so an
+        # entry is never older than the version it is filed under
+        key = (scope, key)
+        with self._lock:
+            current = self._advance(scope, version)
+            entry = self._entries.get(key) if version == current else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                incr("views.cache_hit")
+                return entry[0]
+
+        incr("views.cache_miss")
+        value = build()
+        nbytes = size(value)
+
+        with self._lock:
+            # A session still on an older version gets its view, uncached
+            if version != self._advance(scope, version) or nbytes > self.max_bytes:
+                return value
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                incr("views.evicted")
+        return value
+
+_cache = ViewCache()
+
+def cached_view(version, key, build, size=lambda table: table.nbytes, scope=None):
+    # build() -> value; size(value) -> bytes it holds (default: an Arrow table's)
+    return _cache.get_or_build(version, key, build, size, scope)